@@ -0,0 +1,102 @@
+"""
+Numba-compiled backtest kernels.
+
+These kernels fuse the per-bar work of a full backtest (rolling SMA
+update, signal generation, fill accounting and mark-to-market) into a
+single compiled loop over the column arrays, removing the Python
+interpreter from the hot path entirely. When numba is not installed
+the kernels run as plain Python functions.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def run_ma_crossover(close, adj, short_w, long_w, initial_cash, qty):
+    """
+    Runs a single-symbol moving average crossover backtest over the
+    given close/adj_close arrays with a constant order quantity.
+
+    Mirrors the event-driven MovingAverageCrossStrategy +
+    NaivePortfolio + SimulatedExecutionHandler combination: signals
+    are computed on adj_close, fills execute at the bar close, each
+    fill pays the IB-style commission, and each bar is marked to
+    market before that bar's fill is applied.
+
+    Parameters:
+    close - Close price array (fill prices).
+    adj - Adjusted close price array (signal prices).
+    short_w - The short SMA window length.
+    long_w - The long SMA window length.
+    initial_cash - The starting capital.
+    qty - The constant order quantity per fill.
+
+    Returns:
+    A (cash, positions, total, fills) tuple of per-bar arrays plus
+    the number of fills.
+    """
+    n = adj.shape[0]
+    cash_out = np.empty(n, dtype=np.float64)
+    pos_out = np.zeros(n, dtype=np.int64)
+    total_out = np.empty(n, dtype=np.float64)
+
+    if qty <= 500:
+        commission = max(1.3, 0.013 * qty)
+    else:
+        commission = max(1.3, 0.008 * qty)
+
+    short_sum = 0.0
+    long_sum = 0.0
+    cash = initial_cash
+    cum_commission = 0.0
+    pos = 0
+    state = 0  # 0 = OUT, 1 = LONG
+    fills = 0
+
+    for i in range(n):
+        p = adj[i]
+        if i >= long_w:
+            long_sum -= adj[i - long_w]
+        if i >= short_w:
+            short_sum -= adj[i - short_w]
+        long_sum += p
+        short_sum += p
+
+        # Mark to market before this bar's fill, matching the event
+        # loop where update_timeindex runs ahead of the fill
+        cash_out[i] = cash
+        pos_out[i] = pos
+        total_out[i] = cash - cum_commission + pos * p
+
+        if i >= long_w - 1:
+            short_sma = short_sum / short_w
+            long_sma = long_sum / long_w
+            # NaivePortfolio treats any direction other than BUY/SELL
+            # as a buy, so LONG and EXIT fills both add to the
+            # position; mirrored here so the fast path reproduces the
+            # event loop exactly
+            if short_sma > long_sma and state == 0:
+                cash -= qty * close[i] + commission
+                cum_commission += commission
+                pos += qty
+                state = 1
+                fills += 1
+            elif short_sma < long_sma and state == 1:
+                cash -= qty * close[i] + commission
+                cum_commission += commission
+                pos += qty
+                state = 0
+                fills += 1
+
+    return cash_out, pos_out, total_out, fills
@@ -0,0 +1,60 @@
+"""
+Pure-Python event loop for the backtesting engine.
+
+This module deliberately imports nothing from numpy or pandas: after
+the data handlers were converted to serve plain tuples, the per-bar
+loop is interpreter-bound, so keeping it free of extension-module
+types lets it run unmodified (and fast) under alternative
+interpreters such as PyPy, whose tracing JIT can specialize the
+event dispatch.
+"""
+
+
+def run_event_loop(data_handler, events, dispatch, verbose=False,
+                   progress_every=1024, current_holdings=None):
+    """
+    Drives the bar/event loop until the data handler is exhausted.
+
+    Parameters:
+    data_handler - Object with continue_backtest and update_bars()
+    events - The event deque shared by all components
+    dispatch - Mapping of event type to handler callable
+    verbose - Whether to print periodic progress
+    progress_every - Bars between progress lines (power of two)
+    current_holdings - The portfolio's live holdings dict, used only
+                       for the progress line
+
+    Returns:
+    The number of bars processed.
+    """
+    progress_mask = progress_every - 1
+
+    # Pre-bind the per-iteration lookups as locals: LOAD_FAST on a
+    # local is much cheaper than repeated attribute traversal inside
+    # the loop
+    update_bars = data_handler.update_bars
+    popleft = events.popleft
+    lookup_handler = dispatch.__getitem__
+
+    i = 0
+    while True:
+        i += 1
+
+        # Update the market bars
+        if data_handler.continue_backtest == True:
+            update_bars()
+        else:
+            break
+
+        # Handle the events
+        while events:
+            event = popleft()
+            if event is not None:
+                lookup_handler(event.type)(event)
+
+        # Print the current holdings periodically; the bitmask test
+        # keeps the check cheap in the per-bar loop
+        if verbose and (i & progress_mask) == 0 and current_holdings is not None:
+            print(f"Bar {i}, current portfolio value: {current_holdings['total']}")
+
+    return i
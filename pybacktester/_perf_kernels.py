@@ -0,0 +1,221 @@
+"""
+Compiled kernels for performance statistics.
+
+This module holds the numeric inner loops used by the performance
+analyzer. When numba is installed the kernels are JIT-compiled with
+@njit; otherwise a no-op decorator keeps them running as plain Python
+with identical results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is unavailable."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def drawdown_curve(equity):
+    """
+    Computes the percentage drawdown series of an equity curve in one
+    pass, along with the index of the deepest drawdown.
+
+    NaN equity values (e.g. the seeded first bar) stay NaN in the
+    output and are ignored for the running peak.
+
+    Parameters:
+    equity - The equity curve as a float64 array.
+
+    Returns:
+    A (drawdowns, max_dd_index) tuple; drawdowns are in percent.
+    """
+    n = equity.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    peak = -1.0
+    min_dd = 0.0
+    min_idx = 0
+    for i in range(n):
+        v = equity[i]
+        if v != v:
+            out[i] = np.nan
+            continue
+        if v > peak:
+            peak = v
+        dd = (v - peak) / peak * 100.0
+        out[i] = dd
+        if dd < min_dd:
+            min_dd = dd
+            min_idx = i
+    return out, min_idx
+
+
+@njit(cache=True)
+def column_stats(col):
+    """
+    Computes mean, population std, min and max of a column in one
+    sweep, instead of four separate reductions over the same memory.
+    The accumulators are float64 regardless of the input dtype, so
+    float32 columns lose no variance precision.
+
+    Parameters:
+    col - A one-dimensional float array (float32 or float64).
+
+    Returns:
+    A (mean, std, min, max) tuple.
+    """
+    n = col.size
+    s = 0.0
+    ss = 0.0
+    mn = col[0]
+    mx = col[0]
+    for i in range(n):
+        v = col[i]
+        s += v
+        ss += v * v
+        if v < mn:
+            mn = v
+        if v > mx:
+            mx = v
+    mean = s / n
+    var = ss / n - mean * mean
+    std = np.sqrt(var) if var > 0.0 else 0.0
+    return mean, std, mn, mx
+
+
+@njit(cache=True)
+def return_stats(closes):
+    """
+    Streams the per-bar percentage returns of a price series and
+    accumulates their mean, population std, min and max in one pass,
+    without materializing the returns array.
+
+    Parameters:
+    closes - A one-dimensional float array of closing prices.
+
+    Returns:
+    A (mean, std, min, max) tuple, each in percent.
+    """
+    n = closes.size - 1
+    s = 0.0
+    ss = 0.0
+    mn = 1e300
+    mx = -1e300
+    for i in range(n):
+        r = closes[i + 1] / closes[i] - 1.0
+        s += r
+        ss += r * r
+        if r < mn:
+            mn = r
+        if r > mx:
+            mx = r
+    mean = s / n
+    var = ss / n - mean * mean
+    std = np.sqrt(var) if var > 0.0 else 0.0
+    return mean * 100.0, std * 100.0, mn * 100.0, mx * 100.0
+
+
+@njit(cache=True)
+def equity_curve_stats(returns, equity, rf_per_period):
+    """
+    Computes drawdown and return statistics in one fused pass over
+    the equity curve.
+
+    Parameters:
+    returns - float64 array of per-bar returns (NaN entries skipped)
+    equity - float64 array of the cumulative equity curve
+    rf_per_period - The per-bar risk-free rate to subtract
+
+    Returns:
+    (max_dd, max_dd_idx, ulcer_index, sharpe, sortino,
+     downside_deviation, gross_gain, gross_pain, std)
+    """
+    n = equity.shape[0]
+
+    run_max = 0.0
+    max_dd = 0.0
+    max_dd_idx = 0
+    dd_count = 0
+    sum_sq_dd = 0.0
+    first_dd = True
+
+    ret_count = 0
+    ret_sum = 0.0
+    ret_sumsq = 0.0
+    neg_count = 0
+    neg_sum = 0.0
+    neg_sumsq = 0.0
+    gross_gain = 0.0
+    gross_pain = 0.0
+
+    for i in range(n):
+        v = equity[i]
+        if not np.isnan(v):
+            if first_dd or v > run_max:
+                run_max = v
+            dd = (v - run_max) / run_max
+            if first_dd or dd < max_dd:
+                max_dd = dd
+                max_dd_idx = i
+            first_dd = False
+            dd_count += 1
+            sum_sq_dd += (dd * 100.0) ** 2
+
+        r = returns[i]
+        if not np.isnan(r):
+            e = r - rf_per_period
+            ret_count += 1
+            ret_sum += e
+            ret_sumsq += e * e
+            if e < 0.0:
+                neg_count += 1
+                neg_sum += e
+                neg_sumsq += e * e
+            if e > 0.0:
+                gross_gain += e
+            elif e < 0.0:
+                gross_pain -= e
+
+    # Ulcer index over the valid drawdown entries
+    if dd_count > 0:
+        ulcer = np.sqrt(sum_sq_dd / dd_count)
+    else:
+        ulcer = np.nan
+
+    # Sample mean/std of excess returns (ddof=1, matching pandas)
+    if ret_count > 1:
+        mean_e = ret_sum / ret_count
+        var_e = (ret_sumsq - ret_sum * ret_sum / ret_count) / (ret_count - 1)
+        std_e = np.sqrt(var_e) if var_e > 0.0 else 0.0
+        sharpe = np.sqrt(252.0) * mean_e / std_e if std_e > 0.0 else np.nan
+    else:
+        mean_e = np.nan
+        std_e = np.nan
+        sharpe = np.nan
+
+    # Downside deviation over negative excess returns (ddof=1)
+    if neg_count > 1:
+        neg_var = (neg_sumsq - neg_sum * neg_sum / neg_count) / (neg_count - 1)
+        downside = np.sqrt(252.0) * np.sqrt(neg_var) if neg_var > 0.0 else 0.0
+    else:
+        downside = np.nan
+
+    # Sortino from annualized excess return over downside deviation
+    if not np.isnan(mean_e):
+        annualized = (1.0 + mean_e) ** 252 - 1.0
+    else:
+        annualized = np.nan
+    if downside > 0.0:
+        sortino = annualized / downside
+    else:
+        sortino = np.inf
+
+    return (max_dd, max_dd_idx, ulcer, sharpe, sortino, downside,
+            gross_gain, gross_pain, std_e)
@@ -5,12 +5,27 @@ This module provides the main backtesting engine that coordinates
 all components of the backtesting framework.
 """
 
-import queue
+import collections
+import concurrent.futures
 import time
 from pybacktester.data import HistoricCSVDataHandler
 from pybacktester.portfolio import NaivePortfolio
 from pybacktester.execution import SimulatedExecutionHandler
 from pybacktester.performance import PerformanceAnalyzer
+from pybacktester.event import EventQueue
+from pybacktester._loop_pure import run_event_loop
+
+
+def _run_grid_single(csv_dir, symbol_list, initial_capital, start_date, params):
+    """
+    Worker for Backtester.run_grid: runs one parameter combination
+    and returns its summary statistics (without plotting).
+    """
+    backtester = Backtester(csv_dir, symbol_list, initial_capital,
+                            start_date, verbose=False, **params)
+    backtester._run_backtest()
+    analyzer = PerformanceAnalyzer(backtester.portfolio)
+    return analyzer.get_summary_stats()
 
 
 class Backtester:
@@ -22,7 +37,8 @@ class Backtester:
     def __init__(self, csv_dir, symbol_list, initial_capital, start_date, 
                  data_handler=HistoricCSVDataHandler, 
                  execution_handler=SimulatedExecutionHandler,
-                 portfolio=NaivePortfolio, strategy=None):
+                 portfolio=NaivePortfolio, strategy=None,
+                 verbose=True, progress_every=1024):
         """
         Initializes the backtester.
 
@@ -35,6 +51,8 @@ class Backtester:
         execution_handler - (Class) Handles the orders/fills for trades.
         portfolio - (Class) Keeps track of portfolio current and prior positions.
         strategy - (Class) Generates signals based on market data.
+        verbose - Whether to print progress during the backtest.
+        progress_every - Bars between progress lines (power of two).
         """
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
@@ -46,8 +64,14 @@ class Backtester:
         self.portfolio = portfolio
         self.strategy = strategy
         
-        self.events = queue.Queue()
-        
+        # The backtest is strictly single-threaded, so an unlocked
+        # deque-backed queue avoids the locking overhead of
+        # queue.Queue
+        self.events = EventQueue()
+
+        self.verbose = verbose
+        self.progress_every = progress_every
+
         self.signals = 0
         self.orders = 0
         self.fills = 0
@@ -63,52 +87,64 @@ class Backtester:
         print("Creating DataHandler, Strategy, Portfolio and ExecutionHandler")
         self.data_handler = self.data_handler(self.events, self.csv_dir, self.symbol_list)
         self.strategy = self.strategy(self.data_handler, self.events)
-        self.portfolio = self.portfolio(self.data_handler, self.events, self.start_date, 
+        self.portfolio = self.portfolio(self.data_handler, self.events, self.start_date,
                                         self.initial_capital)
         self.execution_handler = self.execution_handler(self.events, self.data_handler)
+
+        # Precomputed event-type dispatch table, replacing the if/elif
+        # chain in the inner event loop
+        self._dispatch = {
+            'MARKET': self._on_market,
+            'SIGNAL': self._on_signal,
+            'ORDER': self._on_order,
+            'FILL': self._on_fill
+        }
+
+        # Execution handlers that pool FillEvents expose release_fill
+        self._release_fill = getattr(self.execution_handler,
+                                     'release_fill', None)
+
+    def _on_market(self, event):
+        """
+        Handles a MarketEvent by generating signals and rolling the
+        portfolio time index forward.
+        """
+        self.strategy.calculate_signals(event)
+        self.portfolio.update_timeindex(event)
+
+    def _on_signal(self, event):
+        """
+        Handles a SignalEvent by passing it to the portfolio.
+        """
+        self.signals += 1
+        self.portfolio.update_signal(event)
+
+    def _on_order(self, event):
+        """
+        Handles an OrderEvent by passing it to the execution handler.
+        """
+        self.orders += 1
+        self.execution_handler.execute_order(event)
+
+    def _on_fill(self, event):
+        """
+        Handles a FillEvent by updating the portfolio and returning
+        the consumed event to the execution handler's pool.
+        """
+        self.fills += 1
+        self.portfolio.update_fill(event)
+        if self._release_fill is not None:
+            self._release_fill(event)
     
     def _run_backtest(self):
         """
-        Executes the backtest.
+        Executes the backtest by driving the pure-Python event loop.
         """
-        i = 0
-        while True:
-            i += 1
-            print(f"{i}", end="\r")
-            
-            # Update the market bars
-            if self.data_handler.continue_backtest == True:
-                self.data_handler.update_bars()
-            else:
-                break
-            
-            # Handle the events
-            while True:
-                try:
-                    event = self.events.get(False)
-                except queue.Empty:
-                    break
-                else:
-                    if event is not None:
-                        if event.type == 'MARKET':
-                            self.strategy.calculate_signals(event)
-                            self.portfolio.update_timeindex(event)
-                            
-                        elif event.type == 'SIGNAL':
-                            self.signals += 1
-                            self.portfolio.update_signal(event)
-                            
-                        elif event.type == 'ORDER':
-                            self.orders += 1
-                            self.execution_handler.execute_order(event)
-                            
-                        elif event.type == 'FILL':
-                            self.fills += 1
-                            self.portfolio.update_fill(event)
-            
-            # Print the current holdings
-            if i % 1000 == 0:
-                print(f"Current portfolio value: {self.portfolio.current_holdings['total']}")
+        run_event_loop(
+            self.data_handler, self.events, self._dispatch,
+            verbose=self.verbose, progress_every=self.progress_every,
+            current_holdings=self.portfolio.current_holdings
+        )
     
     def _output_performance(self):
         """
@@ -146,6 +182,88 @@ class Backtester:
         
         return self._output_performance()
     
+    def run_fast(self):
+        """
+        Runs the backtest through the fused Numba kernel when the
+        configured components allow it.
+
+        The fast path requires a single-symbol
+        MovingAverageCrossStrategy with a NaivePortfolio on a data
+        handler exposing its column arrays; any other combination
+        falls back to the event-driven loop, which stays correct for
+        user-supplied strategies.
+        """
+        from pybacktester.strategies import MovingAverageCrossStrategy
+        from pybacktester._kernels import run_ma_crossover
+
+        close = getattr(self.data_handler, '_close', None)
+        adj = getattr(self.data_handler, '_adj_close', None)
+        if not (isinstance(self.strategy, MovingAverageCrossStrategy)
+                and isinstance(self.portfolio, NaivePortfolio)
+                and len(self.symbol_list) == 1
+                and close is not None and adj is not None):
+            return self.run()
+
+        s = self.symbol_list[0]
+        print("Running Backtest (fast path)...")
+        t0 = time.time()
+        cash, positions, total, fills = run_ma_crossover(
+            close[s], adj[s],
+            self.strategy.short_window, self.strategy.long_window,
+            float(self.initial_capital), 100
+        )
+        t1 = time.time()
+        self.fills = fills
+        print(f"\nBacktest complete in {t1-t0:.2f} seconds")
+        print(f"Fills: {fills}")
+        return {
+            'cash': cash,
+            'positions': positions,
+            'total': total,
+            'fills': fills
+        }
+
+    @classmethod
+    def run_grid(cls, csv_dir, symbol_list, initial_capital, start_date,
+                 param_grid, max_workers=None):
+        """
+        Runs a grid of backtests in parallel worker processes.
+
+        The bar data is loaded once up front so the binary bar cache
+        is warm; each worker then memory-maps the same read-only
+        arrays and the OS page cache shares them across processes
+        instead of every worker re-parsing the CSVs.
+
+        Parameters:
+        csv_dir - The hard root path to the CSV data directory.
+        symbol_list - The list of symbol strings.
+        initial_capital - The starting capital for each portfolio.
+        start_date - The start datetime of the strategies.
+        param_grid - An iterable of keyword-argument dicts applied on
+                     top of the common settings (e.g. strategy).
+        max_workers - Worker process count (defaults to cpu count).
+
+        Returns:
+        A list of (params, stats) tuples in param_grid order.
+        """
+        param_grid = [dict(p) for p in param_grid]
+
+        # Warm the on-disk bar cache in the parent when every run uses
+        # the default CSV data handler
+        if not any('data_handler' in p for p in param_grid):
+            HistoricCSVDataHandler(collections.deque(), csv_dir, symbol_list)
+
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_run_grid_single, csv_dir, symbol_list,
+                                initial_capital, start_date, params)
+                for params in param_grid
+            ]
+            for params, future in zip(param_grid, futures):
+                results.append((params, future.result()))
+        return results
+
     def get_portfolio(self):
         """
         Returns the portfolio object.
@@ -6,11 +6,21 @@ loading data from CSV files and providing an interface for the
 backtesting engine to access price data.
 """
 
+import os
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
 from pybacktester.event import MarketEvent
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Column layout shared by all CSV bar files
+CSV_COLUMNS = ['datetime', 'open', 'high', 'low', 'close', 'adj_close', 'volume']
+
 
 class DataHandler(ABC):
     """
@@ -48,26 +58,110 @@ class HistoricCSVDataHandler(DataHandler):
     Historic data handler that loads data from CSV files.
     """
     
-    def __init__(self, events, csv_dir, symbol_list):
+    def __init__(self, events, csv_dir, symbol_list, max_lookback=512):
         """
         Initializes the historic data handler.
-        
+
         Parameters:
         events - The event queue object
         csv_dir - Absolute directory path to the CSV data files
         symbol_list - A list of symbol strings
+        max_lookback - The maximum number of recent bars retained per
+                       symbol for get_latest_bars() lookups
         """
         super().__init__(events)
-        
+
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
+        self.max_lookback = max_lookback
         
         self.symbol_data = {}
-        self.latest_symbol_data = {}
         self.continue_backtest = True
-        
+
+        # Per-symbol column arrays, populated by
+        # _open_convert_csv_files(). Every symbol is reindexed onto
+        # the combined index there, so a single scalar cursor marks
+        # the latest released bar for all of them.
+        self._dt = {}
+        self._open = {}
+        self._high = {}
+        self._low = {}
+        self._close = {}
+        self._adj_close = {}
+        self._volume = {}
+        self._cursor = -1
+        self._N = 0
+
         self._open_convert_csv_files()
     
+    def _read_csv(self, path):
+        """
+        Reads one OHLCV CSV into a DataFrame indexed on datetime.
+
+        Uses pyarrow's multi-threaded CSV reader when available,
+        falling back to pandas.read_csv otherwise.
+        """
+        if pa is not None:
+            table = pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(column_names=CSV_COLUMNS,
+                                               skip_rows=1),
+                convert_options=pacsv.ConvertOptions(column_types={
+                    'datetime': pa.timestamp('ns'),
+                    'open': pa.float64(), 'high': pa.float64(),
+                    'low': pa.float64(), 'close': pa.float64(),
+                    'adj_close': pa.float64(), 'volume': pa.float64()
+                })
+            )
+            df = table.to_pandas(self_destruct=True)
+            df.set_index('datetime', inplace=True)
+            return df
+        return pd.read_csv(path, header=0, index_col=0, parse_dates=True,
+                           names=CSV_COLUMNS)
+
+    def _cache_paths(self, symbol):
+        """
+        Returns the (ohlcv, datetime) binary cache paths for a symbol.
+        """
+        cache_dir = os.path.join(self.csv_dir, '.cache')
+        return (os.path.join(cache_dir, f"{symbol}.ohlcv.npy"),
+                os.path.join(cache_dir, f"{symbol}.dt.npy"))
+
+    def _load_symbol_frame(self, symbol):
+        """
+        Loads one symbol's bars as a sorted DataFrame, preferring a
+        memory-mapped binary cache over re-parsing the CSV. The cache
+        is written on first load and refreshed whenever the CSV is
+        newer, so repeated runs (e.g. parameter sweeps) skip parsing
+        entirely and share pages through the OS cache.
+        """
+        csv_path = f"{self.csv_dir}/{symbol}.csv"
+        ohlcv_path, dt_path = self._cache_paths(symbol)
+
+        try:
+            csv_mtime = os.path.getmtime(csv_path)
+            if (os.path.getmtime(ohlcv_path) >= csv_mtime
+                    and os.path.getmtime(dt_path) >= csv_mtime):
+                ohlcv = np.load(ohlcv_path, mmap_mode='r')
+                dt = np.load(dt_path, mmap_mode='r')
+                return pd.DataFrame(
+                    {col: ohlcv[:, j] for j, col in enumerate(CSV_COLUMNS[1:])},
+                    index=pd.DatetimeIndex(dt)
+                )
+        except OSError:
+            pass
+
+        df = self._read_csv(csv_path).sort_index()
+        try:
+            os.makedirs(os.path.dirname(ohlcv_path), exist_ok=True)
+            np.save(ohlcv_path, df.to_numpy(dtype=np.float64))
+            np.save(dt_path, df.index.to_numpy(dtype='datetime64[ns]'))
+        except OSError:
+            # Cache writes are best-effort; a read-only data directory
+            # simply falls back to parsing the CSV each run
+            pass
+        return df
+
     def _open_convert_csv_files(self):
         """
         Opens the CSV files from the data directory, converting
@@ -77,63 +171,107 @@ class HistoricCSVDataHandler(DataHandler):
         taken from Yahoo Finance with headers:
         Date,Open,High,Low,Close,Adj Close,Volume
         """
-        comb_index = None
-        
         for s in self.symbol_list:
-            # Load CSV file with no header information, indexed on date
-            self.symbol_data[s] = pd.read_csv(
-                f"{self.csv_dir}/{s}.csv",
-                header=0, index_col=0, parse_dates=True,
-                names=['datetime', 'open', 'high', 'low', 'close', 'adj_close', 'volume']
-            ).sort_index()
-            
-            # Combine the index to pad forward values
-            if comb_index is None:
-                comb_index = self.symbol_data[s].index
-            else:
-                comb_index.union(self.symbol_data[s].index)
-                
-            # Set the latest symbol_data to None
-            self.latest_symbol_data[s] = []
-        
-        # Reindex the dataframes
+            # Load bars from the binary cache, or parse the CSV
+            self.symbol_data[s] = self._load_symbol_frame(s)
+
+        # Combine all symbol indexes in one concat+unique pass to pad
+        # forward values. (The previous per-symbol Index.union call
+        # discarded its return value, so multi-symbol runs were padded
+        # against the first symbol's index only.)
+        comb_index = pd.DatetimeIndex(np.unique(np.concatenate(
+            [self.symbol_data[s].index.values for s in self.symbol_list]
+        )))
+
+        # Reindex the dataframes and extract each column as a contiguous
+        # NumPy array so that update_bars() performs plain indexed reads
+        # instead of per-row pandas Series lookups
         for s in self.symbol_list:
-            self.symbol_data[s] = self.symbol_data[s].reindex(index=comb_index, method='pad').iterrows()
-    
-    def _get_new_bar(self, symbol):
+            df = self.symbol_data[s].reindex(index=comb_index, method='pad')
+            self.symbol_data[s] = df
+            self._dt[s] = df.index.to_numpy(dtype='datetime64[ns]')
+            self._open[s] = df['open'].to_numpy(dtype=np.float64)
+            self._high[s] = df['high'].to_numpy(dtype=np.float64)
+            self._low[s] = df['low'].to_numpy(dtype=np.float64)
+            self._close[s] = df['close'].to_numpy(dtype=np.float64)
+            self._adj_close[s] = df['adj_close'].to_numpy(dtype=np.float64)
+            self._volume[s] = df['volume'].to_numpy(dtype=np.float64)
+        self._N = len(comb_index)
+
+    def _materialize(self, symbol, lo, hi):
         """
-        Returns the latest bar from the data feed as a tuple of
-        (datetime, open, high, low, close, adj_close, volume).
+        Builds legacy bar tuples for a [lo, hi) slice of the column
+        arrays.
         """
-        for b in self.symbol_data[symbol]:
-            yield b
-    
+        return list(zip(self._dt[symbol][lo:hi], self._open[symbol][lo:hi],
+                        self._high[symbol][lo:hi], self._low[symbol][lo:hi],
+                        self._close[symbol][lo:hi],
+                        self._adj_close[symbol][lo:hi],
+                        self._volume[symbol][lo:hi]))
+
+    @property
+    def latest_symbol_data(self):
+        """
+        Legacy view of all bars released so far, materialized as
+        tuples per symbol on access.
+        """
+        i = self._cursor
+        return {s: (self._materialize(s, 0, i + 1) if i >= 0 else [])
+                for s in self.symbol_list}
+
+    def current_adj_close_vector(self):
+        """
+        Returns the datetime of the latest released bar together with
+        an array of every symbol's latest adj_close, in symbol_list
+        order, or None before the first bar has been released. All
+        symbols share the combined index, so one read covers them all.
+        """
+        i = self._cursor
+        if i < 0:
+            return None
+        prices = np.fromiter(
+            (self._adj_close[s][i] for s in self.symbol_list),
+            dtype=np.float64, count=len(self.symbol_list)
+        )
+        return self._dt[self.symbol_list[0]][i], prices
+
+    def get_latest_adj_close_window(self, symbol, N=1):
+        """
+        Returns a zero-copy ndarray view of the last N released
+        adj_close values for a symbol, or fewer if less bars are
+        available.
+        """
+        i = self._cursor
+        if i < 0:
+            return self._adj_close[symbol][:0]
+        return self._adj_close[symbol][max(0, i + 1 - N):i + 1]
+
     def get_latest_bars(self, symbol, N=1):
         """
         Returns the last N bars from the latest_symbol list,
-        or fewer if less bars are available.
+        or fewer if less bars are available. Lookback is capped at
+        max_lookback bars, matching the bounded buffer this handler
+        used to keep.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
+        if symbol not in self._dt:
             print(f"That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-N:]
-    
+            raise KeyError(symbol)
+        i = self._cursor
+        if i < 0:
+            return []
+        lo = max(0, i + 1 - min(N, self.max_lookback))
+        return self._materialize(symbol, lo, i + 1)
+
     def update_bars(self):
         """
         Pushes the latest bar to the latest symbol structure
-        for all symbols in the symbol list.
+        for all symbols in the symbol list. Advancing the shared
+        cursor is the only per-bar work; bar tuples are built lazily
+        when a consumer asks for them.
         """
-        for s in self.symbol_list:
-            try:
-                bar = next(self.symbol_data[s])
-                # bar is a tuple (timestamp, pandas.Series)
-                bar_data = (bar[0], bar[1]['open'], bar[1]['high'], bar[1]['low'], 
-                           bar[1]['close'], bar[1]['adj_close'], bar[1]['volume'])
-                self.latest_symbol_data[s].append(bar_data)
-            except StopIteration:
-                self.continue_backtest = False
-        if self.continue_backtest:
-            self.events.put(MarketEvent())
+        i = self._cursor + 1
+        if i >= self._N:
+            self.continue_backtest = False
+            return
+        self._cursor = i
+        self.events.append(MarketEvent())
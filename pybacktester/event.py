@@ -6,21 +6,61 @@ a backtesting session, including market events, signal events, order events,
 and fill events.
 """
 
+import collections
+import queue
+import sys
+
+# Event type codes shared by the event classes and the dispatchers.
+# Interned so consumers can compare them with `is` (a pointer check)
+# in hot loops, while `==` against plain strings keeps working.
+MARKET = sys.intern('MARKET')
+SIGNAL = sys.intern('SIGNAL')
+ORDER = sys.intern('ORDER')
+FILL = sys.intern('FILL')
+
+
+class EventQueue(collections.deque):
+    """
+    Unlocked event queue for the single-threaded backtest loop.
+
+    A plain deque subclass, so the hot loop uses append/popleft
+    directly, while put/get stay available for code written against
+    the old queue.Queue interface.
+    """
+
+    put = collections.deque.append
+
+    def get(self, block=True):
+        """
+        Pops the oldest event, raising queue.Empty when exhausted.
+
+        Parameters:
+        block - Accepted for queue.Queue compatibility; this queue
+                never blocks.
+        """
+        try:
+            return self.popleft()
+        except IndexError:
+            raise queue.Empty from None
+
+
 class Event:
     """Base event class."""
-    pass
+    __slots__ = ()
 
 
 class MarketEvent(Event):
     """
     Handles the event of receiving a new market update.
     """
+
+    __slots__ = ('type',)
     
     def __init__(self):
         """
         Initialises the MarketEvent.
         """
-        self.type = 'MARKET'
+        self.type = MARKET
 
 
 class SignalEvent(Event):
@@ -28,6 +68,9 @@ class SignalEvent(Event):
     Handles the event of sending a Signal from a Strategy object.
     This is received by a Portfolio object and acted upon.
     """
+
+    __slots__ = ('type', 'strategy_id', 'symbol', 'datetime',
+                 'signal_type', 'strength')
     
     def __init__(self, strategy_id, symbol, datetime, signal_type, strength):
         """
@@ -43,7 +86,7 @@ class SignalEvent(Event):
                    the quantity at the portfolio level. Useful for
                    pairs strategies.
         """
-        self.type = 'SIGNAL'
+        self.type = SIGNAL
         self.strategy_id = strategy_id
         self.symbol = symbol
         self.datetime = datetime
@@ -58,6 +101,8 @@ class OrderEvent(Event):
     and a direction.
     """
 
+    __slots__ = ('type', 'symbol', 'order_type', 'quantity', 'direction')
+
     def __init__(self, symbol, order_type, quantity, direction):
         """
         Initialises the order type, setting whether it is
@@ -70,7 +115,7 @@ class OrderEvent(Event):
         quantity - Non-negative integer for quantity.
         direction - 'BUY' or 'SELL' for long or short.
         """
-        self.type = 'ORDER'
+        self.type = ORDER
         self.symbol = symbol
         self.order_type = order_type
         self.quantity = quantity
@@ -92,6 +137,9 @@ class FillEvent(Event):
     the commission of the trade from the brokerage.
     """
 
+    __slots__ = ('type', 'timeindex', 'datetime', 'symbol', 'exchange',
+                 'quantity', 'direction', 'fill_cost', 'commission')
+
     def __init__(self, timeindex, symbol, exchange, quantity, 
                  direction, fill_cost, commission=None):
         """
@@ -112,7 +160,7 @@ class FillEvent(Event):
         fill_cost - The holdings value in dollars.
         commission - An optional commission sent from IB.
         """
-        self.type = 'FILL'
+        self.type = FILL
         self.timeindex = timeindex
         self.datetime = timeindex
         self.symbol = symbol
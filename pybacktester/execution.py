@@ -7,7 +7,7 @@ generating fill events based on market data.
 
 import datetime
 from abc import ABC, abstractmethod
-from pybacktester.event import FillEvent
+from pybacktester.event import FillEvent, ORDER, FILL
 
 
 class ExecutionHandler(ABC):
@@ -49,7 +49,41 @@ class SimulatedExecutionHandler(ExecutionHandler):
         """
         self.events = events
         self.bars = bars
-    
+
+        # Freelist of consumed FillEvents for reuse; events are
+        # processed immediately in the single-threaded loop, so a
+        # released instance is never still referenced downstream
+        self._fill_pool = []
+
+    def release_fill(self, event):
+        """
+        Returns a consumed FillEvent to the pool for reuse.
+
+        Parameters:
+        event - The FillEvent that has been fully processed.
+        """
+        if len(self._fill_pool) < 1024:
+            self._fill_pool.append(event)
+
+    def _make_fill(self, timeindex, symbol, exchange, quantity,
+                   direction, fill_cost):
+        """
+        Builds a FillEvent, reusing a pooled instance when available
+        to avoid a fresh allocation per order.
+        """
+        pool = self._fill_pool
+        fill = pool.pop() if pool else FillEvent.__new__(FillEvent)
+        fill.type = FILL
+        fill.timeindex = timeindex
+        fill.datetime = timeindex
+        fill.symbol = symbol
+        fill.exchange = exchange
+        fill.quantity = quantity
+        fill.direction = direction
+        fill.fill_cost = fill_cost
+        fill.commission = fill.calculate_ib_commission()
+        return fill
+
     def execute_order(self, event):
         """
         Simply converts Order objects into Fill objects naively,
@@ -58,21 +92,27 @@ class SimulatedExecutionHandler(ExecutionHandler):
         Parameters:
         event - Contains an Event object with order information.
         """
-        if event.type == 'ORDER':
-            # Get the current market price if available
+        if event.type is ORDER:
+            # Get the current market price and bar time if available.
+            # Fills are stamped with the simulated bar datetime, not
+            # wall-clock time.
             fill_cost = 75.0  # Default price
+            fill_datetime = None
             if self.bars is not None:
                 try:
                     bars = self.bars.get_latest_bars(event.symbol, N=1)
                     if bars and len(bars) > 0:
-                        # Use the close price from the latest bar
-                        fill_cost = bars[0][4]  # Close price
+                        bar = bars[0]
+                        fill_datetime = bar[0]
+                        fill_cost = bar[4]  # Close price
                 except Exception:
                     # If we can't get the price, use the default
                     pass
-            
-            fill_event = FillEvent(
-                datetime.datetime.utcnow(), event.symbol,
+            if fill_datetime is None:
+                fill_datetime = datetime.datetime.utcnow()
+
+            fill_event = self._make_fill(
+                fill_datetime, event.symbol,
                 'ARCA', event.quantity, event.direction, fill_cost
             )
-            self.events.put(fill_event)
+            self.events.append(fill_event)
@@ -7,7 +7,8 @@ for backtesting results.
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from pybacktester._perf_kernels import equity_curve_stats
 
 
 class PerformanceAnalyzer:
@@ -24,17 +25,75 @@ class PerformanceAnalyzer:
         """
         self.portfolio = portfolio
         self.equity_curve = self._create_equity_curve()
-    
+        self._kernel_cache = {}
+        self._summary = None
+        self._cagr = None
+        self._fig = None
+        self._ax = None
+        self._prep_trade_stats()
+
+    def _prep_trade_stats(self):
+        """
+        Extracts trade profits into a contiguous array so the trade
+        metrics can be computed without re-scanning all_trades.
+        """
+        profits = getattr(self.portfolio, '_trades_profit', None)
+        if profits is None:
+            trades = getattr(self.portfolio, 'all_trades', None)
+            profits = [t['profit'] for t in trades] if trades else []
+        if profits:
+            self._profits = np.array(profits, dtype=np.float64)
+        else:
+            self._profits = np.empty(0, dtype=np.float64)
+        self._has_trades = self._profits.size > 0
+        self._winning = self._profits[self._profits > 0]
+        self._losing = self._profits[self._profits < 0]
+
     def _create_equity_curve(self):
         """
         Creates an equity curve from the portfolio holdings.
         """
-        curve = pd.DataFrame(self.portfolio.all_holdings)
-        curve.set_index('datetime', inplace=True)
-        curve['returns'] = curve['total'].pct_change()
-        curve['equity_curve'] = (1.0 + curve['returns']).cumprod()
-        return curve
-    
+        holdings = self.portfolio.all_holdings
+        n = len(holdings)
+
+        # Extract the totals and datetimes directly into arrays rather
+        # than letting pandas infer columns from the list of dicts
+        total = np.fromiter((h['total'] for h in holdings),
+                            dtype=np.float64, count=n)
+        dt = np.array([h['datetime'] for h in holdings],
+                      dtype='datetime64[ns]')
+
+        returns = np.empty(n, dtype=np.float64)
+        returns[0] = np.nan
+        np.divide(total[1:], total[:-1], out=returns[1:])
+        returns[1:] -= 1.0
+
+        equity = np.empty(n, dtype=np.float64)
+        equity[0] = np.nan
+        np.cumprod(1.0 + returns[1:], out=equity[1:])
+
+        # Cache contiguous arrays for the compiled statistics kernel
+        self._returns_arr = returns
+        self._equity_arr = equity
+
+        return pd.DataFrame(
+            {'total': total, 'returns': returns, 'equity_curve': equity},
+            index=pd.DatetimeIndex(dt, name='datetime')
+        )
+
+    def _kernel_stats(self, risk_free_rate=0.0):
+        """
+        Returns the fused kernel statistics tuple, memoized per
+        risk-free rate.
+        """
+        try:
+            return self._kernel_cache[risk_free_rate]
+        except KeyError:
+            stats = equity_curve_stats(self._returns_arr, self._equity_arr,
+                                       risk_free_rate / 252)
+            self._kernel_cache[risk_free_rate] = stats
+            return stats
+
     def calculate_sharpe_ratio(self, risk_free_rate=0.0):
         """
         Calculate the Sharpe ratio of the strategy.
@@ -45,32 +104,17 @@ class PerformanceAnalyzer:
         Returns:
         Sharpe ratio
         """
-        # Calculate the excess returns
-        excess_returns = self.equity_curve['returns'] - risk_free_rate / 252
-        
-        # Calculate annualized Sharpe ratio
-        sharpe_ratio = np.sqrt(252) * (excess_returns.mean() / excess_returns.std())
-        return sharpe_ratio
-    
+        return self._kernel_stats(risk_free_rate)[3]
+
     def calculate_max_drawdown(self):
         """
         Calculate the maximum drawdown of the strategy.
-        
+
         Returns:
         Max drawdown, duration
         """
-        # Calculate the cumulative returns curve and maximum cumulative returns curve
-        cumulative = self.equity_curve['equity_curve']
-        cumulative_max = cumulative.cummax()
-        
-        # Calculate the drawdowns
-        drawdowns = (cumulative - cumulative_max) / cumulative_max
-        
-        # Calculate the max drawdown and duration
-        max_drawdown = drawdowns.min()
-        max_drawdown_duration = drawdowns.idxmin()
-        
-        return max_drawdown, max_drawdown_duration
+        max_drawdown, max_dd_idx = self._kernel_stats()[:2]
+        return max_drawdown, self.equity_curve.index[max_dd_idx]
     
     def calculate_cagr(self):
         """
@@ -79,14 +123,17 @@ class PerformanceAnalyzer:
         Returns:
         CAGR
         """
+        if self._cagr is not None:
+            return self._cagr
+
         # Get the number of days in the strategy
         start_date = self.equity_curve.index[0]
         end_date = self.equity_curve.index[-1]
         days = (end_date - start_date).days
-        
+
         # Calculate CAGR
-        cagr = (self.equity_curve['equity_curve'].iloc[-1]) ** (365.0 / days) - 1
-        return cagr
+        self._cagr = (self._equity_arr[-1]) ** (365.0 / days) - 1
+        return self._cagr
     
     def calculate_win_ratio(self):
         """
@@ -95,11 +142,9 @@ class PerformanceAnalyzer:
         Returns:
         Win ratio
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades:
             return 0.0
-        
-        profitable_trades = [trade for trade in self.portfolio.all_trades if trade['profit'] > 0]
-        return len(profitable_trades) / len(self.portfolio.all_trades) * 100 if self.portfolio.all_trades else 0.0
+        return self._winning.size / self._profits.size * 100
     
     def calculate_profit_factor(self):
         """
@@ -108,12 +153,10 @@ class PerformanceAnalyzer:
         Returns:
         Profit factor
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades:
             return 0.0
-        
-        gross_profit = sum(trade['profit'] for trade in self.portfolio.all_trades if trade['profit'] > 0)
-        gross_loss = abs(sum(trade['profit'] for trade in self.portfolio.all_trades if trade['profit'] < 0))
-        
+        gross_profit = self._winning.sum()
+        gross_loss = -self._losing.sum()
         return gross_profit / gross_loss if gross_loss > 0 else float('inf')
     
     def calculate_car_mdd(self):
@@ -135,20 +178,7 @@ class PerformanceAnalyzer:
         Returns:
         Ulcer Index
         """
-        # Calculate the percentage drawdowns
-        cumulative = self.equity_curve['equity_curve']
-        cumulative_max = cumulative.cummax()
-        drawdowns = (cumulative - cumulative_max) / cumulative_max * 100
-        
-        # Calculate the squared drawdowns
-        squared_drawdowns = drawdowns ** 2
-        
-        # Calculate the average of squared drawdowns
-        avg_squared_drawdowns = squared_drawdowns.mean()
-        
-        # Calculate the Ulcer Index
-        ulcer_index = np.sqrt(avg_squared_drawdowns)
-        return ulcer_index
+        return self._kernel_stats()[2]
     
     def calculate_expectancy(self):
         """
@@ -157,11 +187,9 @@ class PerformanceAnalyzer:
         Returns:
         Expectancy
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades:
             return 0.0
-        
-        total_profit = sum(trade['profit'] for trade in self.portfolio.all_trades)
-        return total_profit / len(self.portfolio.all_trades) if self.portfolio.all_trades else 0.0
+        return self._profits.mean()
     
     def calculate_sortino_ratio(self, risk_free_rate=0.0):
         """
@@ -173,31 +201,16 @@ class PerformanceAnalyzer:
         Returns:
         Sortino ratio
         """
-        # Calculate the excess returns
-        excess_returns = self.equity_curve['returns'] - risk_free_rate / 252
-        
-        # Calculate downside deviation (volatility of negative returns only)
-        negative_returns = excess_returns[excess_returns < 0]
-        downside_deviation = np.sqrt(252) * negative_returns.std()
-        
-        # Calculate annualized return
-        annualized_return = (1 + excess_returns.mean()) ** 252 - 1
-        
-        # Calculate Sortino ratio
-        sortino_ratio = annualized_return / downside_deviation if downside_deviation > 0 else float('inf')
-        return sortino_ratio
-    
+        return self._kernel_stats(risk_free_rate)[4]
+
     def calculate_downside_deviation(self):
         """
         Calculate downside deviation (volatility of negative returns only).
-        
+
         Returns:
         Downside deviation
         """
-        # Calculate downside deviation (volatility of negative returns only)
-        negative_returns = self.equity_curve['returns'][self.equity_curve['returns'] < 0]
-        downside_deviation = np.sqrt(252) * negative_returns.std()
-        return downside_deviation
+        return self._kernel_stats()[5]
     
     def calculate_calmar_ratio(self):
         """
@@ -230,12 +243,7 @@ class PerformanceAnalyzer:
         Returns:
         Gain to pain ratio
         """
-        positive_returns = self.equity_curve['returns'][self.equity_curve['returns'] > 0]
-        negative_returns = self.equity_curve['returns'][self.equity_curve['returns'] < 0]
-        
-        total_gains = positive_returns.sum()
-        total_losses = abs(negative_returns.sum())
-        
+        total_gains, total_losses = self._kernel_stats()[6:8]
         return total_gains / total_losses if total_losses > 0 else float('inf')
     
     def calculate_average_trade_net_profit(self):
@@ -245,11 +253,9 @@ class PerformanceAnalyzer:
         Returns:
         Average trade net profit
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades:
             return 0.0
-        
-        total_profit = sum(trade['profit'] for trade in self.portfolio.all_trades)
-        return total_profit / len(self.portfolio.all_trades) if self.portfolio.all_trades else 0.0
+        return self._profits.mean()
     
     def calculate_payoff_ratio(self):
         """
@@ -258,15 +264,10 @@ class PerformanceAnalyzer:
         Returns:
         Payoff ratio
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades:
             return 0.0
-        
-        winning_trades = [trade['profit'] for trade in self.portfolio.all_trades if trade['profit'] > 0]
-        losing_trades = [abs(trade['profit']) for trade in self.portfolio.all_trades if trade['profit'] < 0]
-        
-        avg_winning = np.mean(winning_trades) if winning_trades else 0.0
-        avg_losing = np.mean(losing_trades) if losing_trades else 0.0
-        
+        avg_winning = self._winning.mean() if self._winning.size else 0.0
+        avg_losing = -self._losing.mean() if self._losing.size else 0.0
         return avg_winning / avg_losing if avg_losing > 0 else float('inf')
     
     def calculate_average_winning_trade(self):
@@ -276,11 +277,9 @@ class PerformanceAnalyzer:
         Returns:
         Average winning trade
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades or not self._winning.size:
             return 0.0
-        
-        winning_trades = [trade['profit'] for trade in self.portfolio.all_trades if trade['profit'] > 0]
-        return np.mean(winning_trades) if winning_trades else 0.0
+        return self._winning.mean()
     
     def calculate_average_losing_trade(self):
         """
@@ -289,11 +288,9 @@ class PerformanceAnalyzer:
         Returns:
         Average losing trade
         """
-        if not hasattr(self.portfolio, 'all_trades') or not self.portfolio.all_trades:
+        if not self._has_trades or not self._losing.size:
             return 0.0
-        
-        losing_trades = [abs(trade['profit']) for trade in self.portfolio.all_trades if trade['profit'] < 0]
-        return np.mean(losing_trades) if losing_trades else 0.0
+        return -self._losing.mean()
     
     def get_summary_stats(self):
         """
@@ -302,26 +299,38 @@ class PerformanceAnalyzer:
         Returns:
         Dictionary of performance statistics
         """
+        if self._summary is not None:
+            return self._summary
+
+        # One fused kernel pass supplies every equity-curve statistic;
+        # the ratio metrics are then scalar arithmetic on its outputs
+        (max_dd, _, ulcer, sharpe, sortino, downside,
+         gains, losses, std) = self._kernel_stats()
+        cagr = self.calculate_cagr()
+        total_return = self._equity_arr[-1] - 1.0
+        abs_dd = abs(max_dd)
+
         stats = {}
-        stats['Total Return'] = (self.equity_curve['equity_curve'].iloc[-1] - 1.0) * 100
-        stats['Sharpe Ratio'] = self.calculate_sharpe_ratio()
-        stats['Max Drawdown'], _ = self.calculate_max_drawdown()
-        stats['Max Drawdown %'] = stats['Max Drawdown'] * 100
-        stats['CAGR'] = self.calculate_cagr() * 100
-        stats['Volatility'] = self.equity_curve['returns'].std() * np.sqrt(252) * 100
+        stats['Total Return'] = total_return * 100
+        stats['Sharpe Ratio'] = sharpe
+        stats['Max Drawdown'] = max_dd
+        stats['Max Drawdown %'] = max_dd * 100
+        stats['CAGR'] = cagr * 100
+        stats['Volatility'] = std * np.sqrt(252) * 100
         stats['Win Ratio'] = self.calculate_win_ratio()
-        stats['CAR/MDD'] = self.calculate_car_mdd()
-        stats['Ulcer Index'] = self.calculate_ulcer_index()
+        stats['CAR/MDD'] = cagr / abs_dd if abs_dd != 0 else float('inf')
+        stats['Ulcer Index'] = ulcer
         stats['Expectancy'] = self.calculate_expectancy()
-        stats['Sortino Ratio'] = self.calculate_sortino_ratio()
-        stats['Downside Deviation'] = self.calculate_downside_deviation()
-        stats['Calmar Ratio'] = self.calculate_calmar_ratio()
-        stats['Recovery Factor'] = self.calculate_recovery_factor()
-        stats['Gain to Pain Ratio'] = self.calculate_gain_to_pain_ratio()
+        stats['Sortino Ratio'] = sortino
+        stats['Downside Deviation'] = downside
+        stats['Calmar Ratio'] = cagr / abs_dd if abs_dd != 0 else float('inf')
+        stats['Recovery Factor'] = total_return / abs_dd if abs_dd != 0 else float('inf')
+        stats['Gain to Pain Ratio'] = gains / losses if losses > 0 else float('inf')
         stats['Average Trade Net Profit'] = self.calculate_average_trade_net_profit()
         stats['Average Winning Trade'] = self.calculate_average_winning_trade()
         stats['Average Losing Trade'] = self.calculate_average_losing_trade()
-        
+
+        self._summary = stats
         return stats
     
     def plot_equity_curve(self, filename='equity_curve.png'):
@@ -331,11 +340,24 @@ class PerformanceAnalyzer:
         Parameters:
         filename - The filename to save the plot to
         """
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.equity_curve.index, self.equity_curve['equity_curve'])
-        plt.title('Equity Curve')
-        plt.xlabel('Date')
-        plt.ylabel('Cumulative Returns')
-        plt.grid(True)
-        plt.savefig(filename)
-        plt.close()
+        # Import lazily and build the figure outside the pyplot
+        # registry: pyplot keeps a global reference per figure, so
+        # one analyzer per request would leak figures without bound.
+        # A plain Figure with an Agg canvas is garbage-collected with
+        # the analyzer and never probes a GUI backend.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if self._fig is None:
+            self._fig = Figure(figsize=(10, 6))
+            FigureCanvasAgg(self._fig)
+            self._ax = self._fig.add_subplot()
+
+        ax = self._ax
+        ax.cla()
+        ax.plot(self.equity_curve.index, self.equity_curve['equity_curve'])
+        ax.set_title('Equity Curve')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Cumulative Returns')
+        ax.grid(True)
+        self._fig.savefig(filename)
@@ -10,14 +10,20 @@ from math import floor
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
-from pybacktester.event import OrderEvent
+from pybacktester.event import OrderEvent, SIGNAL, FILL
 
 
 class Portfolio(ABC):
     """
     Abstract base class for portfolio managers.
     """
-    
+
+    __slots__ = ('bars', 'events', 'symbol_list', 'start_date',
+                 'initial_capital', '_symbols', '_n_symbols',
+                 'current_positions', 'current_holdings', '_price_vector',
+                 '_dt', '_cash', '_commission', '_total', '_pos', '_mv',
+                 '_row')
+
     def __init__(self, bars, events, start_date, initial_capital=100000.0):
         """
         Initializes the portfolio.
@@ -33,29 +39,106 @@ class Portfolio(ABC):
         self.symbol_list = self.bars.symbol_list
         self.start_date = start_date
         self.initial_capital = initial_capital
-        
-        self.all_positions = self.construct_all_positions()
-        self.current_positions = dict((k, v) for k, v in 
-                                      [(s, 0) for s in self.symbol_list])
-        
-        self.all_holdings = self.construct_all_holdings()
+
+        # Immutable snapshot of the symbols and their count for the
+        # per-bar loops
+        self._symbols = tuple(self.symbol_list)
+        self._n_symbols = len(self._symbols)
+
+        self.current_positions = dict.fromkeys(self.symbol_list, 0)
         self.current_holdings = self.construct_current_holdings()
+
+        # Data handlers with column arrays expose the latest prices of
+        # all symbols in one call; mocks and older handlers fall back
+        # to per-symbol get_latest_bars
+        self._price_vector = getattr(self.bars, 'current_adj_close_vector',
+                                     None)
+
+        # History is kept as preallocated struct-of-arrays storage;
+        # the dict-list views (all_positions/all_holdings) are built
+        # lazily when asked for
+        self._alloc_history()
+        self._dt[0] = np.datetime64(self.start_date)
+        self._cash[0] = self.initial_capital
+        self._total[0] = self.initial_capital
+        self._row = 1
+
+    def _alloc_history(self):
+        """
+        Preallocates the history arrays, sized to the bar count when
+        the data handler exposes its symbol data.
+        """
+        n_rows = 1024
+        symbol_data = getattr(self.bars, 'symbol_data', None)
+        if symbol_data:
+            try:
+                n_rows = len(symbol_data[self.symbol_list[0]]) + 1
+            except (KeyError, TypeError):
+                pass
+        n_symbols = len(self.symbol_list)
+        self._dt = np.zeros(n_rows, dtype='datetime64[ns]')
+        self._cash = np.zeros(n_rows, dtype=np.float64)
+        self._commission = np.zeros(n_rows, dtype=np.float64)
+        self._total = np.zeros(n_rows, dtype=np.float64)
+        self._pos = np.zeros((n_rows, n_symbols), dtype=np.int64)
+        self._mv = np.zeros((n_rows, n_symbols), dtype=np.float64)
+
+    def _grow_history(self):
+        """
+        Doubles the history capacity when the preallocation was
+        too small.
+        """
+        for name in ('_dt', '_cash', '_commission', '_total',
+                     '_pos', '_mv'):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros_like(arr)]))
+
+    @property
+    def all_positions(self):
+        """
+        The positions history as a list of per-bar dicts, materialized
+        from the underlying arrays for backwards compatibility.
+        """
+        rows = []
+        for i in range(self._row):
+            d = {s: int(self._pos[i, j])
+                 for j, s in enumerate(self.symbol_list)}
+            d['datetime'] = self._dt[i]
+            rows.append(d)
+        return rows
+
+    @property
+    def all_holdings(self):
+        """
+        The holdings history as a list of per-bar dicts, materialized
+        from the underlying arrays for backwards compatibility.
+        """
+        rows = []
+        for i in range(self._row):
+            d = {s: float(self._mv[i, j])
+                 for j, s in enumerate(self.symbol_list)}
+            d['datetime'] = self._dt[i]
+            d['cash'] = float(self._cash[i])
+            d['commission'] = float(self._commission[i])
+            d['total'] = float(self._total[i])
+            rows.append(d)
+        return rows
     
     def construct_all_positions(self):
         """
-        Constructs the positions list using start_date
-        to determine when the time index will begin.
+        Compatibility shim: the initial positions row now lives at
+        index 0 of the history arrays, seeded in __init__.
         """
-        d = dict((k, v) for k, v in [(s, 0) for s in self.symbol_list])
+        d = dict.fromkeys(self.symbol_list, 0)
         d['datetime'] = self.start_date
         return [d]
-    
+
     def construct_all_holdings(self):
         """
-        Constructs the holdings list using start_date
-        to determine when the time index will begin.
+        Compatibility shim: the initial holdings row now lives at
+        index 0 of the history arrays, seeded in __init__.
         """
-        d = dict((k, v) for k, v in [(s, 0.0) for s in self.symbol_list])
+        d = dict.fromkeys(self.symbol_list, 0.0)
         d['datetime'] = self.start_date
         d['cash'] = self.initial_capital
         d['commission'] = 0.0
@@ -67,7 +150,7 @@ class Portfolio(ABC):
         This constructs the dictionary which will hold the instantaneous
         value of the portfolio across all symbols.
         """
-        d = dict((k, v) for k, v in [(s, 0.0) for s in self.symbol_list])
+        d = dict.fromkeys(self.symbol_list, 0.0)
         d['cash'] = self.initial_capital
         d['commission'] = 0.0
         d['total'] = self.initial_capital
@@ -95,45 +178,70 @@ class Portfolio(ABC):
         market data bar. This reflects the PREVIOUS bar, i.e. all
         current market data at this stage is known (OHLCV).
         """
-        bars = self.bars.get_latest_bars(self.symbol_list[0])
-        if not bars:
-            return
-            
-        latest_datetime = bars[0][0]
-        
-        # Update positions
-        dp = dict((k, v) for k, v in [(s, 0) for s in self.symbol_list])
-        dp['datetime'] = latest_datetime
-        
-        for s in self.symbol_list:
-            dp[s] = self.current_positions[s]
-        
-        # Append the current positions
-        self.all_positions.append(dp)
-        
-        # Update holdings
-        dh = dict((k, v) for k, v in [(s, 0) for s in self.symbol_list])
-        dh['datetime'] = latest_datetime
-        dh['cash'] = self.current_holdings['cash']
-        dh['commission'] = self.current_holdings['commission']
-        
+        prices = None
+        symbol_bars = None
+        if self._price_vector is not None:
+            latest = self._price_vector()
+            if latest is None:
+                return
+            latest_datetime, prices = latest
+        else:
+            # One get_latest_bars call per symbol; the shared bar
+            # datetime comes from the first symbol with data
+            symbol_bars = [self.bars.get_latest_bars(s)
+                           for s in self._symbols]
+            latest_datetime = next(
+                (bars[0][0] for bars in symbol_bars if bars), None
+            )
+            if latest_datetime is None:
+                return
+
+        row = self._row
+        if row >= self._dt.shape[0]:
+            self._grow_history()
+
+        cash = self.current_holdings['cash']
+        commission = self.current_holdings['commission']
+        self._dt[row] = np.datetime64(latest_datetime)
+        self._cash[row] = cash
+        self._commission[row] = commission
+
         # Calculate total value based on current market prices
-        total_value = self.current_holdings['cash'] - self.current_holdings['commission']
-        for s in self.symbol_list:
-            # Get current market value based on positions and latest price
-            bars = self.bars.get_latest_bars(s)
-            if bars:
-                market_value = self.current_positions[s] * bars[0][5]  # Using adj_close
-                dh[s] = market_value
-                total_value += market_value
-        
-        dh['total'] = total_value
-        
+        total_value = cash - commission
+        if prices is not None:
+            # One vectorised mark-to-market over all symbols.
+            # Pad-reindexed symbols carry a NaN head before their
+            # first real bar; the position there is necessarily 0,
+            # so a zero market value is exact and keeps NaN out of
+            # the running totals.
+            positions = np.fromiter(
+                (self.current_positions[s] for s in self._symbols),
+                dtype=np.int64, count=self._n_symbols
+            )
+            market_values = positions * np.where(np.isfinite(prices),
+                                                 prices, 0.0)
+            self._pos[row] = positions
+            self._mv[row] = market_values
+            total_value += market_values.sum()
+        else:
+            for j, s in enumerate(self._symbols):
+                position = self.current_positions[s]
+                self._pos[row, j] = position
+                # Current market value based on positions and latest
+                # price; NaN prices (no real bar yet) mark to zero,
+                # matching the vector path
+                bars = symbol_bars[j]
+                if bars and np.isfinite(bars[0][5]):
+                    market_value = position * bars[0][5]  # Using adj_close
+                    self._mv[row, j] = market_value
+                    total_value += market_value
+
+        self._total[row] = total_value
+
         # Update current_holdings with the new total
         self.current_holdings['total'] = total_value
-        
-        # Append the current holdings
-        self.all_holdings.append(dh)
+
+        self._row = row + 1
 
 
 class NaivePortfolio(Portfolio):
@@ -143,15 +251,50 @@ class NaivePortfolio(Portfolio):
     i.e. without any risk management or position sizing. It is
     used to test simpler strategies such as BuyAndHold.
     """
-    
+
+    __slots__ = ('_last_fill_price', '_trades_symbol', '_trades_direction',
+                 '_trades_quantity', '_trades_price', '_trades_commission',
+                 '_trades_profit', '_trades_datetime')
+
     def __init__(self, bars, events, start_date, initial_capital=100000.0):
         """
         Initializes the portfolio with data and an event queue.
         Also includes a starting datetime index and initial capital.
         """
         super().__init__(bars, events, start_date, initial_capital)
-        self.symbol_list = bars.symbol_list
-        self.all_trades = []
+
+        # Last fill price per symbol for the naive profit calculation
+        self._last_fill_price = {}
+
+        # Trades are stored as parallel typed lists, one per field;
+        # the all_trades view materializes dicts on demand
+        self._trades_symbol = []
+        self._trades_direction = []
+        self._trades_quantity = []
+        self._trades_price = []
+        self._trades_commission = []
+        self._trades_profit = []
+        self._trades_datetime = []
+
+    @property
+    def all_trades(self):
+        """
+        The trade history as a list of per-fill dicts, materialized
+        from the underlying field lists for backwards compatibility.
+        """
+        return [
+            {
+                'symbol': s, 'direction': d, 'quantity': q,
+                'price': p, 'commission': c, 'profit': pr,
+                'datetime': dt
+            }
+            for s, d, q, p, c, pr, dt in zip(
+                self._trades_symbol, self._trades_direction,
+                self._trades_quantity, self._trades_price,
+                self._trades_commission, self._trades_profit,
+                self._trades_datetime
+            )
+        ]
     
     def update_signal(self, event):
         """
@@ -159,18 +302,18 @@ class NaivePortfolio(Portfolio):
         sizing of the signal object, without risk management or
         position sizing considerations.
         """
-        if event.type == 'SIGNAL':
+        if event.type is SIGNAL:
             order_event = OrderEvent(
                 event.symbol, 'MKT', 100, event.signal_type
             )
-            self.events.put(order_event)
+            self.events.append(order_event)
     
     def update_fill(self, event):
         """
         Updates the portfolio current positions and holdings
         from a FillEvent.
         """
-        if event.type == 'FILL':
+        if event.type is FILL:
             # Check whether the fill is a buy or sell
             fill_dir = 0
             if event.direction == 'BUY':
@@ -184,30 +327,25 @@ class NaivePortfolio(Portfolio):
             # Calculate profit/loss for this trade
             # This is a simplified calculation - in a real system, you'd track entry prices
             profit = 0
-            if hasattr(self, '_last_fill_price') and event.symbol in self._last_fill_price:
+            if event.symbol in self._last_fill_price:
                 # Calculate profit based on price difference
                 if fill_dir == -1:  # Sell order
                     profit = (event.fill_cost - self._last_fill_price[event.symbol]) * event.quantity
                 elif fill_dir == 1:  # Buy order
                     if self.current_positions[event.symbol] < 0:  # Closing a short position
                         profit = (self._last_fill_price[event.symbol] - event.fill_cost) * event.quantity
-            
+
             # Store the fill price for profit calculation
-            if not hasattr(self, '_last_fill_price'):
-                self._last_fill_price = {}
             self._last_fill_price[event.symbol] = event.fill_cost
-            
-            # Record the trade
-            trade = {
-                'symbol': event.symbol,
-                'direction': event.direction,
-                'quantity': event.quantity,
-                'price': event.fill_cost,
-                'commission': event.commission,
-                'profit': profit,
-                'datetime': event.datetime
-            }
-            self.all_trades.append(trade)
+
+            # Record the trade, one append per field
+            self._trades_symbol.append(event.symbol)
+            self._trades_direction.append(event.direction)
+            self._trades_quantity.append(event.quantity)
+            self._trades_price.append(event.fill_cost)
+            self._trades_commission.append(event.commission)
+            self._trades_profit.append(profit)
+            self._trades_datetime.append(event.datetime)
             
             # Update positions list with new quantities
             self.current_positions[event.symbol] += fill_dir * event.quantity
@@ -5,10 +5,10 @@ This module provides example implementations of trading strategies
 that can be used with the backtesting framework.
 """
 
-import datetime
+import collections
 import numpy as np
 from pybacktester.strategy import Strategy
-from pybacktester.event import SignalEvent
+from pybacktester.event import SignalEvent, MARKET
 
 
 class BuyAndHoldStrategy(Strategy):
@@ -16,7 +16,9 @@ class BuyAndHoldStrategy(Strategy):
     This is an extremely simple strategy that goes LONG all of the
     symbols as soon as a bar is received and never exits.
     """
-    
+
+    __slots__ = ('bought',)
+
     def __init__(self, bars, events):
         """
         Initializes the buy and hold strategy.
@@ -35,10 +37,7 @@ class BuyAndHoldStrategy(Strategy):
         Adds keys to the bought dictionary for all symbols
         and sets them to False.
         """
-        bought = {}
-        for s in self.symbol_list:
-            bought[s] = False
-        return bought
+        return dict.fromkeys(self.symbol_list, False)
     
     def calculate_signals(self, event):
         """
@@ -50,14 +49,21 @@ class BuyAndHoldStrategy(Strategy):
         Parameters:
         event - A MarketEvent object
         """
-        if event.type == 'MARKET':
+        if event.type is MARKET:
             for s in self.symbol_list:
                 bars = self.bars.get_latest_bars(s, N=1)
                 if bars is not None and len(bars) > 0:
                     if self.bought[s] == False:
+                        # Wait for the symbol's first finite price:
+                        # the padded combined index carries a NaN
+                        # head for late-listed symbols, and a buy
+                        # there would fill at NaN and poison the cash
+                        # balance
+                        if not np.isfinite(bars[-1][5]):
+                            continue
                         # (Symbol, Datetime, Type = LONG, SHORT or EXIT)
-                        signal = SignalEvent(1, s, datetime.datetime.utcnow(), 'LONG', 1.0)
-                        self.events.put(signal)
+                        signal = SignalEvent(1, s, bars[-1][0], 'LONG', 1.0)
+                        self.events.append(signal)
                         self.bought[s] = True
 
 
@@ -66,7 +72,10 @@ class MovingAverageCrossStrategy(Strategy):
     Carries out a basic Moving Average Crossover strategy with a
     short/long simple weighted moving average. Uses 9/26 periods.
     """
-    
+
+    __slots__ = ('short_window', 'long_window', 'bought', '_prices',
+                 '_short_sum', '_long_sum', '_n', '_adj_window')
+
     def __init__(self, bars, events):
         """
         Initializes the Moving Average Cross Strategy with 9/26 periods.
@@ -79,19 +88,31 @@ class MovingAverageCrossStrategy(Strategy):
         
         self.short_window = 9
         self.long_window = 26
-        
+
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
+
+        # Rolling price window and running sums per symbol, so each
+        # bar updates the SMAs in O(1) instead of re-averaging the
+        # whole window
+        self._prices = {s: collections.deque(maxlen=self.long_window)
+                        for s in self.symbol_list}
+        self._short_sum = {s: 0.0 for s in self.symbol_list}
+        self._long_sum = {s: 0.0 for s in self.symbol_list}
+        self._n = dict.fromkeys(self.symbol_list, 0)
+
+        # Data handlers with column arrays expose the latest prices
+        # as a zero-copy ndarray view, avoiding a bar-tuple build per
+        # symbol per bar; other handlers fall back to get_latest_bars
+        self._adj_window = getattr(bars, 'get_latest_adj_close_window',
+                                   None)
     
     def _calculate_initial_bought(self):
         """
         Adds keys to the bought dictionary for all symbols
         and sets them to 'OUT'.
         """
-        bought = {}
-        for s in self.symbol_list:
-            bought[s] = 'OUT'
-        return bought
+        return dict.fromkeys(self.symbol_list, 'OUT')
     
     def calculate_signals(self, event):
         """
@@ -103,22 +124,57 @@ class MovingAverageCrossStrategy(Strategy):
         Parameters:
         event - A MarketEvent object
         """
-        if event.type == 'MARKET':
+        if event.type is MARKET:
             for s in self.symbol_list:
-                bars = self.bars.get_latest_bars(s, N=self.long_window)
-                
-                if len(bars) >= self.long_window:
-                    # Calculate the simple moving averages
-                    short_sma = np.mean([bar[5] for bar in bars[-self.short_window:]])
-                    long_sma = np.mean([bar[5] for bar in bars[-self.long_window:]])
-                    
-                    # Trading signals based on moving average crossover
+                if self._adj_window is not None:
+                    w = self._adj_window(s, 1)
+                    if w.size == 0:
+                        continue
+                    price = w[-1]
+                else:
+                    bars = self.bars.get_latest_bars(s, N=1)
+                    if not bars:
+                        continue
+                    price = bars[-1][5]
+
+                # Symbols listed after the combined index start carry
+                # a NaN head (reindex with padding); a NaN must never
+                # enter the running sums, where it would stick
+                # forever, nor count toward the warm-up
+                if not np.isfinite(price):
+                    continue
+
+                # Roll the new adj_close into the running sums,
+                # retiring the prices that leave each window. The bar
+                # counter replaces per-bar len() checks and keeps the
+                # warm-up period explicit.
+                prices = self._prices[s]
+                n = self._n[s]
+                if n >= self.long_window:
+                    self._long_sum[s] -= prices[0]
+                if n >= self.short_window:
+                    self._short_sum[s] -= prices[-self.short_window]
+                prices.append(price)
+                self._short_sum[s] += price
+                self._long_sum[s] += price
+                n += 1
+                self._n[s] = n
+
+                if n >= self.long_window:
+                    short_sma = self._short_sum[s] / self.short_window
+                    long_sma = self._long_sum[s] / self.long_window
+
+                    # Trading signals based on moving average
+                    # crossover; the bar tuple (for its datetime) is
+                    # only built when a signal actually fires
                     if short_sma > long_sma and self.bought[s] == 'OUT':
-                        signal = SignalEvent(1, s, datetime.datetime.utcnow(), 'LONG', 1.0)
-                        self.events.put(signal)
+                        dt = self.bars.get_latest_bars(s, N=1)[-1][0]
+                        signal = SignalEvent(1, s, dt, 'LONG', 1.0)
+                        self.events.append(signal)
                         self.bought[s] = 'LONG'
-                    
+
                     elif short_sma < long_sma and self.bought[s] == 'LONG':
-                        signal = SignalEvent(1, s, datetime.datetime.utcnow(), 'EXIT', 1.0)
-                        self.events.put(signal)
+                        dt = self.bars.get_latest_bars(s, N=1)[-1][0]
+                        signal = SignalEvent(1, s, dt, 'EXIT', 1.0)
+                        self.events.append(signal)
                         self.bought[s] = 'OUT'
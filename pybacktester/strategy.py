@@ -12,7 +12,9 @@ class Strategy(ABC):
     """
     Abstract base class for trading strategies.
     """
-    
+
+    __slots__ = ('bars', 'events', 'symbol_list')
+
     def __init__(self, bars, events):
         """
         Initializes the strategy.
@@ -5,113 +5,262 @@ This module provides functionality to fetch market data from Yahoo Finance
 and process it for use in the backtesting framework.
 """
 
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from platformdirs import user_cache_dir
 from pybacktester.data import DataHandler
 from pybacktester.event import MarketEvent
 
+logger = logging.getLogger(__name__)
+
 
 class YahooFinanceDataHandler(DataHandler):
     """
     Yahoo Finance data handler that fetches data from Yahoo Finance API.
     """
     
-    def __init__(self, events, csv_dir, symbol_list, start_date=None):
+    def __init__(self, events, csv_dir, symbol_list, start_date=None,
+                 use_cache=True):
         """
         Initializes the Yahoo Finance data handler.
-        
+
         Parameters:
         events - The event queue object
         csv_dir - CSV directory (not used for Yahoo Finance)
         symbol_list - A list of symbol strings
         start_date - The start date for fetching data (datetime object)
+        use_cache - Whether to keep downloaded bars in an on-disk
+                    parquet cache and skip the network on warm runs
         """
         super().__init__(events)
-        
+
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
         self.start_date = start_date if start_date else datetime(2020, 1, 1)
         self.end_date = datetime.now()
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(user_cache_dir("pybacktester"),
+                                      "yahoo")
         
         self.symbol_data = {}
-        self.latest_symbol_data = {}
         self.continue_backtest = True
         self.current_index = 0
-        
+
+        # Per-symbol column arrays and cursors populated by
+        # _fetch_data(); the cursor marks the latest released bar
+        self._cols = {}
+        self._cursor = {}
+
         self._fetch_data()
-    
+
+    def _cache_path(self, symbol):
+        """
+        Returns the parquet cache path for a symbol's download window.
+
+        The key includes both window end points as dates, so stable
+        historical windows are cached permanently while the default
+        end date of "now" rolls over at midnight and triggers a fresh
+        download at most once per day.
+        """
+        key = f"{symbol}|{self.start_date.date()}|{self.end_date.date()}"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{symbol}_{digest}.parquet")
+
+    def _load_cached_frame(self, symbol):
+        """
+        Loads a symbol's cached bars, or returns None on a cache miss.
+        """
+        try:
+            return pd.read_parquet(self._cache_path(symbol))
+        except Exception:
+            return None
+
+    def _store_cached_frame(self, symbol, data):
+        """
+        Writes a symbol's bars to the parquet cache, best-effort.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data.to_parquet(self._cache_path(symbol), compression='zstd')
+        except Exception:
+            # An unwritable cache directory simply means the next run
+            # downloads again
+            pass
+
+    def _fetch_one(self, symbol):
+        """
+        Downloads one symbol's bars through Ticker.history. Used as
+        the throttle-friendly fallback when the batched download is
+        unavailable.
+        """
+        return yf.Ticker(symbol).history(start=self.start_date,
+                                         end=self.end_date,
+                                         auto_adjust=False)
+
     def _fetch_data(self):
         """
         Fetches data from Yahoo Finance for all symbols.
         """
-        print("Fetching data from Yahoo Finance...")
-        
+        logger.info("Fetching data from Yahoo Finance...")
+
+        frames = {}
+        missing = []
+        for symbol in self.symbol_list:
+            cached = self._load_cached_frame(symbol) if self.use_cache else None
+            if cached is not None:
+                frames[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        # One batched, multi-threaded download for the symbols the
+        # cache could not serve, instead of a serialized HTTP round
+        # trip per ticker
+        if missing:
+            try:
+                frame = yf.download(missing, start=self.start_date,
+                                    end=self.end_date, group_by='ticker',
+                                    threads=True, progress=False,
+                                    auto_adjust=False)
+            except Exception as e:
+                logger.error("Error fetching data: %s", e)
+                frame = None
+            if frame is not None:
+                multi = isinstance(frame.columns, pd.MultiIndex)
+                for symbol in missing:
+                    try:
+                        # A single symbol comes back as a flat frame;
+                        # multiple symbols are keyed by (symbol, field)
+                        data = frame[symbol] if multi else frame
+                    except KeyError:
+                        continue
+                    data = data.dropna(how='all')
+                    frames[symbol] = data
+                    if self.use_cache and not data.empty:
+                        self._store_cached_frame(symbol, data)
+            else:
+                # Batch mode failed: overlap the per-ticker round
+                # trips, since each history() call is I/O bound
+                workers = min(8, len(missing))
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    futures = {ex.submit(self._fetch_one, s): s
+                               for s in missing}
+                    for future in as_completed(futures):
+                        symbol = futures[future]
+                        try:
+                            data = future.result().dropna(how='all')
+                        except Exception as e:
+                            logger.warning("Error fetching data for %s: %s",
+                                           symbol, e)
+                            continue
+                        frames[symbol] = data
+                        if self.use_cache and not data.empty:
+                            self._store_cached_frame(symbol, data)
+
         for symbol in self.symbol_list:
-            print(f"Fetching data for {symbol}...")
             try:
-                # Fetch data from Yahoo Finance
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(start=self.start_date, end=self.end_date)
-                
-                if data.empty:
-                    print(f"No data found for {symbol}")
+                data = frames.get(symbol)
+                if data is None or data.empty:
+                    logger.warning("No data found for %s", symbol)
                     continue
-                
-                # Convert to the format expected by the framework
-                data.reset_index(inplace=True)
-                print(f"Columns in fetched data: {data.columns.tolist()}")
-                
-                # Handle column names (they might be different)
-                column_mapping = {
-                    'Date': 'datetime',
-                    'Open': 'open',
-                    'High': 'high',
-                    'Low': 'low',
-                    'Close': 'close',
-                    'Adj Close': 'adj_close',
-                    'Volume': 'volume'
+
+                # Extract the columns straight into arrays: yfinance
+                # already returns a sorted DatetimeIndex, so the old
+                # reset_index/rename/sort_values chain is unnecessary
+                idx = data.index
+                if getattr(idx, 'tz', None) is not None:
+                    idx = idx.tz_localize(None)
+                close = data['Close'].to_numpy(dtype=np.float64)
+                adj_close = (data['Adj Close'].to_numpy(dtype=np.float64)
+                             if 'Adj Close' in data.columns else close)
+
+                # Keep the frame for inspection alongside the
+                # contiguous column arrays used by the bar loop
+                self.symbol_data[symbol] = data
+                self._cols[symbol] = {
+                    'dt': idx.to_numpy(dtype='datetime64[ns]'),
+                    'open': data['Open'].to_numpy(dtype=np.float64),
+                    'high': data['High'].to_numpy(dtype=np.float64),
+                    'low': data['Low'].to_numpy(dtype=np.float64),
+                    'close': close,
+                    'adj_close': adj_close,
+                    'volume': data['Volume'].to_numpy(dtype=np.float64)
                 }
-                
-                # Only rename columns that exist
-                existing_columns = {k: v for k, v in column_mapping.items() if k in data.columns}
-                data.rename(columns=existing_columns, inplace=True)
-                
-                # Convert timezone-aware datetime to timezone-naive
-                if hasattr(data['datetime'].dt, 'tz') and data['datetime'].dt.tz is not None:
-                    data['datetime'] = data['datetime'].dt.tz_localize(None)
-                
-                # Add missing columns if needed
-                if 'adj_close' not in data.columns and 'close' in data.columns:
-                    data['adj_close'] = data['close']
-                
-                # Sort by datetime
-                data.sort_values('datetime', inplace=True)
-                data.reset_index(drop=True, inplace=True)
-                
-                # Convert to list for sequential access
-                self.symbol_data[symbol] = list(data.iterrows())
-                self.latest_symbol_data[symbol] = []
+                self._cursor[symbol] = -1
                 self.current_index = 0
-                
+
             except Exception as e:
-                print(f"Error fetching data for {symbol}: {e}")
-        
-        print("Data fetching complete.")
+                logger.error("Error fetching data for %s: %s", symbol, e)
+
+        logger.info("Data fetching complete.")
     
+    def _materialize(self, symbol, lo, hi):
+        """
+        Builds legacy bar tuples for a [lo, hi) slice of the column
+        arrays.
+        """
+        cols = self._cols[symbol]
+        return list(zip(cols['dt'][lo:hi], cols['open'][lo:hi],
+                        cols['high'][lo:hi], cols['low'][lo:hi],
+                        cols['close'][lo:hi], cols['adj_close'][lo:hi],
+                        cols['volume'][lo:hi]))
+
+    @property
+    def latest_symbol_data(self):
+        """
+        Legacy view of all bars released so far, materialized as
+        tuples per symbol on access.
+        """
+        return {s: (self._materialize(s, 0, i + 1) if i >= 0 else [])
+                for s, i in self._cursor.items()}
+
+    def current_adj_close_vector(self):
+        """
+        Returns the datetime of the latest released bar together with
+        an array of every symbol's latest adj_close, in symbol_list
+        order, or None before the first bar has been released.
+        """
+        first = self.symbol_list[0]
+        i = self._cursor.get(first, -1)
+        if i < 0:
+            return None
+        prices = np.fromiter(
+            (self._cols[s]['adj_close'][self._cursor[s]]
+             for s in self.symbol_list),
+            dtype=np.float64, count=len(self.symbol_list)
+        )
+        return self._cols[first]['dt'][i], prices
+
+    def get_latest_adj_close_window(self, symbol, N=1):
+        """
+        Returns a zero-copy ndarray view of the last N released
+        adj_close values for a symbol, or fewer if less bars are
+        available.
+        """
+        adj = self._cols[symbol]['adj_close']
+        i = self._cursor[symbol]
+        if i < 0:
+            return adj[:0]
+        return adj[max(0, i - N + 1):i + 1]
+
     def get_latest_bars(self, symbol, N=1):
         """
         Returns the last N bars from the latest_symbol list,
         or fewer if less bars are available.
         """
         try:
-            bars_list = self.latest_symbol_data[symbol]
+            i = self._cursor[symbol]
         except KeyError:
-            print(f"That symbol is not available in the historical data set.")
+            logger.error("That symbol is not available in the historical data set.")
             raise
-        else:
-            return bars_list[-N:] if bars_list else []
+        if i < 0:
+            return []
+        return self._materialize(symbol, max(0, i - N + 1), i + 1)
     
     def update_bars(self):
         """
@@ -124,25 +273,14 @@ class YahooFinanceDataHandler(DataHandler):
             
         no_more_data = True  # Assume no more data for any symbol
         
+        i = self.current_index
         for symbol in self.symbol_list:
-            if symbol in self.symbol_data and self.current_index < len(self.symbol_data[symbol]):
-                try:
-                    # Get the next row of data
-                    row = self.symbol_data[symbol][self.current_index]
-                    bar_data = (
-                        row[1]['datetime'],
-                        row[1]['open'],
-                        row[1]['high'],
-                        row[1]['low'],
-                        row[1]['close'],
-                        row[1]['adj_close'],
-                        row[1]['volume']
-                    )
-                    self.latest_symbol_data[symbol].append(bar_data)
-                    no_more_data = False  # We still have data for at least one symbol
-                except Exception as e:
-                    print(f"Error processing data for {symbol}: {e}")
-                    pass
+            cols = self._cols.get(symbol)
+            if cols is not None and i < len(cols['dt']):
+                # Advancing the cursor releases the bar; no tuples are
+                # built until a consumer asks for them
+                self._cursor[symbol] = i
+                no_more_data = False  # We still have data for at least one symbol
         
         # Increment the current index
         self.current_index += 1
@@ -151,7 +289,7 @@ class YahooFinanceDataHandler(DataHandler):
         self.continue_backtest = not no_more_data
         
         if self.continue_backtest:
-            self.events.put(MarketEvent())
+            self.events.append(MarketEvent())
 
 
 def fetch_yahoo_finance_data(symbol, start_date, end_date=None):
@@ -174,5 +312,5 @@ def fetch_yahoo_finance_data(symbol, start_date, end_date=None):
         data = ticker.history(start=start_date, end=end_date)
         return data
     except Exception as e:
-        print(f"Error fetching data for {symbol}: {e}")
+        logger.error("Error fetching data for %s: %s", symbol, e)
         return pd.DataFrame()
@@ -15,7 +15,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'pybacktester'))
 
 # Import framework components
-from pybacktester.event import MarketEvent, SignalEvent, OrderEvent, FillEvent
+from pybacktester.event import MarketEvent, SignalEvent, OrderEvent, FillEvent, EventQueue
 from pybacktester.strategy import Strategy
 from pybacktester.portfolio import Portfolio
 from pybacktester.execution import ExecutionHandler
@@ -23,6 +23,12 @@ from pybacktester.backtester import Backtester
 from pybacktester.yfinance_data import YahooFinanceDataHandler
 from pybacktester.strategies import BuyAndHoldStrategy, MovingAverageCrossStrategy
 
+# Fixed timestamps for mock events and backtest windows; real event
+# timestamps come from the bar data, and a constant here keeps the
+# tight test event loops free of per-event clock syscalls
+FIXED_DT = datetime.datetime(2024, 1, 1)
+FIXED_START = datetime.datetime(2020, 1, 1)
+
 
 class TestEvents(unittest.TestCase):
     """Test event classes."""
@@ -34,7 +40,7 @@ class TestEvents(unittest.TestCase):
     
     def test_signal_event(self):
         """Test SignalEvent creation."""
-        event = SignalEvent(1, 'AAPL', datetime.datetime.now(), 'LONG', 1.0)
+        event = SignalEvent(1, 'AAPL', FIXED_DT, 'LONG', 1.0)
         self.assertEqual(event.type, 'SIGNAL')
         self.assertEqual(event.symbol, 'AAPL')
         self.assertEqual(event.signal_type, 'LONG')
@@ -50,7 +56,7 @@ class TestEvents(unittest.TestCase):
     
     def test_fill_event(self):
         """Test FillEvent creation."""
-        event = FillEvent(datetime.datetime.now(), 'AAPL', 'ARCA', 100, 'BUY', 150.0)
+        event = FillEvent(FIXED_DT, 'AAPL', 'ARCA', 100, 'BUY', 150.0)
         self.assertEqual(event.type, 'FILL')
         self.assertEqual(event.symbol, 'AAPL')
         self.assertEqual(event.exchange, 'ARCA')
@@ -61,32 +67,38 @@ class TestEvents(unittest.TestCase):
 
 class MockDataHandler:
     """Mock data handler for testing."""
-    
+
+    __slots__ = ('symbol_list',)
+
     def __init__(self):
         self.symbol_list = ['AAPL']
     
     def get_latest_bars(self, symbol, N=1):
         """Return mock bar data."""
         # Return mock data: (datetime, open, high, low, close, adj_close, volume)
-        return [(datetime.datetime.now(), 150.0, 155.0, 149.0, 153.0, 153.0, 1000000)]
+        return [(FIXED_DT, 150.0, 155.0, 149.0, 153.0, 153.0, 1000000)]
 
 
 class MockStrategy(Strategy):
     """Mock strategy for testing."""
-    
+
+    __slots__ = ()
+
     def __init__(self, bars, events):
         super().__init__(bars, events)
     
     def calculate_signals(self, event):
         """Generate a mock signal."""
         if event.type == 'MARKET':
-            signal = SignalEvent(1, 'AAPL', datetime.datetime.now(), 'LONG', 1.0)
+            signal = SignalEvent(1, 'AAPL', FIXED_DT, 'LONG', 1.0)
             self.events.put(signal)
 
 
 class MockPortfolio(Portfolio):
     """Mock portfolio for testing."""
-    
+
+    __slots__ = ()
+
     def __init__(self, bars, events, start_date, initial_capital=100000.0):
         super().__init__(bars, events, start_date, initial_capital)
     
@@ -103,14 +115,16 @@ class MockPortfolio(Portfolio):
 
 class MockExecutionHandler(ExecutionHandler):
     """Mock execution handler for testing."""
-    
+
+    __slots__ = ('events',)
+
     def __init__(self, events):
         self.events = events
     
     def execute_order(self, event):
         """Generate a mock fill."""
         if event.type == 'ORDER':
-            fill = FillEvent(datetime.datetime.now(), 'AAPL', 'ARCA', 100, 'BUY', 150.0)
+            fill = FillEvent(FIXED_DT, 'AAPL', 'ARCA', 100, 'BUY', 150.0)
             self.events.put(fill)
 
 
@@ -119,13 +133,13 @@ class TestFrameworkIntegration(unittest.TestCase):
     
     def test_event_flow(self):
         """Test the flow of events through the framework."""
-        # Create event queue
-        events = queue.Queue()
+        # Create event queue (unlocked deque with the old put/get API)
+        events = EventQueue()
         
         # Create mock components
         data_handler = MockDataHandler()
         strategy = MockStrategy(data_handler, events)
-        portfolio = MockPortfolio(data_handler, events, datetime.datetime.now())
+        portfolio = MockPortfolio(data_handler, events, FIXED_DT)
         execution = MockExecutionHandler(events)
         
         # Create a market event
@@ -165,7 +179,7 @@ class TestCompleteBacktest(unittest.TestCase):
         # Configuration
         symbol_list = ['AAPL']
         initial_capital = 100000.0
-        start_date = datetime(2020, 1, 1)
+        start_date = FIXED_START
         
         try:
             # Create backtester with Yahoo Finance data
@@ -202,7 +216,7 @@ class TestCompleteBacktest(unittest.TestCase):
         # Configuration
         symbol_list = ['AAPL']
         initial_capital = 100000.0
-        start_date = datetime(2020, 1, 1)
+        start_date = FIXED_START
         
         try:
             # Create backtester with Yahoo Finance data
@@ -247,9 +261,9 @@ def run_integration_tests():
     
     # Test data handler
     try:
-        events = queue.Queue()
+        events = EventQueue()
         symbol_list = ['AAPL']
-        start_date = datetime(2020, 1, 1)
+        start_date = FIXED_START
         
         data_handler = YahooFinanceDataHandler(events, None, symbol_list, start_date)
         if data_handler.symbol_data:
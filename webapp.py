@@ -4,16 +4,26 @@ Web application for PyBacktester.
 This module provides a web interface to run backtests and visualize results.
 """
 
+import asyncio
+import collections
+import concurrent.futures
+import gzip
 import os
 import sys
 import json
-import base64
+import threading
+import uuid
+from functools import lru_cache
 from io import BytesIO
-from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_file
+from datetime import datetime, date
+import orjson
+from quart import Quart, render_template, request, send_file, abort
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from matplotlib.patches import Polygon
 import pandas as pd
 import numpy as np
 
@@ -23,205 +33,452 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'pybacktester'))
 from pybacktester.backtester import Backtester
 from pybacktester.yfinance_data import YahooFinanceDataHandler
 from pybacktester.strategies import BuyAndHoldStrategy, MovingAverageCrossStrategy
+from pybacktester._perf_kernels import (drawdown_curve, column_stats,
+                                        return_stats)
 
 
-app = Flask(__name__)
+app = Quart(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
+# Gzip settings for text-like responses (the flask-compress
+# defaults, applied through the after_request hook below since the
+# app is Quart)
+_COMPRESS_MIN_SIZE = 1024
+_COMPRESS_LEVEL = 6
+_COMPRESSIBLE = ('application/json', 'text/html', 'text/css',
+                 'application/javascript', 'image/svg+xml')
+
+
+@app.after_request
+async def _gzip_response(response):
+    """
+    Compresses large text-like responses when the client accepts
+    gzip; a long data_stats payload shrinks several-fold over the
+    wire, and SVG plots compress even better.
+    """
+    if ('gzip' not in request.headers.get('Accept-Encoding', '').lower()
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or not response.content_type.startswith(_COMPRESSIBLE)):
+        return response
+    body = await response.get_data()
+    if len(body) < _COMPRESS_MIN_SIZE:
+        return response
+    compressed = gzip.compress(body, _COMPRESS_LEVEL)
+    if len(compressed) >= len(body):
+        return response
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+    vary = response.headers.get('Vary')
+    response.headers['Vary'] = (f'{vary}, Accept-Encoding' if vary
+                                else 'Accept-Encoding')
+    return response
+
+# One persistent figure reused across requests: the axes are cleared
+# and redrawn per backtest instead of allocating and tearing down a
+# fresh Agg canvas every time. The lock serializes plotting, which is
+# not thread-safe in matplotlib.
+_FIG, (_AX1, _AX2) = plt.subplots(2, 1, figsize=(16, 12),
+                                  gridspec_kw={'height_ratios': [3, 1]},
+                                  layout='tight')
+_FIG_LOCK = threading.Lock()
+
+# Rendered plot images kept for the /plot/<pid> endpoint, oldest
+# evicted first once the cap is reached
+_PLOT_CACHE = collections.OrderedDict()
+_PLOT_CACHE_MAX = 128
+
+# Worker process pool started at boot; requests fall back to the
+# event loop's thread executor when it is not running (e.g. under
+# the test client)
+_POOL = None
+
+
+def _warm_worker():
+    """
+    Initializer for backtest worker processes: pre-imports the heavy
+    modules and triggers Numba compilation of the stats kernels, so
+    the first real request in each worker skips the JIT warmup.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from pybacktester._perf_kernels import (drawdown_curve, column_stats,
+                                            return_stats)
+    warm = np.array([1.0, 2.0, 1.5])
+    drawdown_curve(warm)
+    column_stats(warm)
+    return_stats(warm)
+
+
+def _start_worker_pool():
+    """
+    Starts the process pool that services /run_backtest, one warmed
+    worker per CPU.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=_warm_worker)
+    return _POOL
+
+
+@lru_cache(maxsize=64)
+def _load_symbol_arrays(symbols_key, start_iso, day):
+    """
+    Fetches and prepares the bar data once per (symbols, start date).
+
+    Repeat requests for the same window reuse the in-process copy
+    instead of hitting the network or re-parsing the disk cache. The
+    day argument keys the cache by calendar day so live windows
+    refresh at most once per day.
+    """
+    handler = YahooFinanceDataHandler(collections.deque(), None,
+                                      list(symbols_key),
+                                      datetime.fromisoformat(start_iso))
+    return handler.symbol_data, handler._cols
+
+
+class _CachedYahooHandler(YahooFinanceDataHandler):
+    """
+    Yahoo Finance handler that takes its prepared data from the
+    in-process LRU instead of fetching per request.
+    """
+
+    def _fetch_data(self):
+        symbol_data, cols = _load_symbol_arrays(
+            tuple(sorted(self.symbol_list)),
+            self.start_date.date().isoformat(),
+            date.today().isoformat()
+        )
+        self.symbol_data = symbol_data
+        self._cols = cols
+        self._cursor = dict.fromkeys(cols, -1)
+        self.current_index = 0
+
+
+# Available strategies: name -> (class, display label, default
+# parameters). A static table instead of per-request branching, and
+# the single place to register a new strategy.
+_STRATEGIES = {
+    'buy_and_hold': (BuyAndHoldStrategy, 'Buy and Hold', {}),
+    'moving_average': (MovingAverageCrossStrategy,
+                       'Moving Average Crossover',
+                       {'short_window': 9, 'long_window': 26})
+}
+
+
+def _json_response(payload):
+    """
+    Serializes a response payload with orjson instead of the stdlib
+    json encoder; number-heavy payloads encode several times faster,
+    and NumPy scalars are handled natively.
+    """
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
 
 @app.route('/')
-def index():
+async def index():
     """Render the main page."""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 
-@app.route('/run_backtest', methods=['POST'])
-def run_backtest():
-    """Run a backtest and return the results."""
-    try:
-        # Get parameters from the request
-        data = request.get_json()
-        symbols = data.get('symbols', 'AAPL').split(',')
-        symbols = [s.strip() for s in symbols]
-        strategy_name = data.get('strategy', 'buy_and_hold')
-        start_date_str = data.get('start_date', '2020-01-01')
-        initial_capital = float(data.get('initial_capital', 1000))
-        
-        # Parse start date
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-        
-        # Select strategy
-        if strategy_name == 'moving_average':
-            strategy = MovingAverageCrossStrategy
-            strategy_label = 'Moving Average Crossover'
-            # Create a temporary instance to get parameters
-            temp_strategy = strategy.__new__(strategy)
-            temp_strategy.short_window = 9
-            temp_strategy.long_window = 26
-            strategy_params = {
-                'short_window': temp_strategy.short_window,
-                'long_window': temp_strategy.long_window
-            }
-        else:
-            strategy = BuyAndHoldStrategy
-            strategy_label = 'Buy and Hold'
-            strategy_params = {}
-        
-        # Create backtester with Yahoo Finance data
-        backtester = Backtester(
-            csv_dir=None,  # Not used with Yahoo Finance data
-            symbol_list=symbols,
-            initial_capital=initial_capital,
-            start_date=start_date,
-            data_handler=YahooFinanceDataHandler,
-            strategy=strategy
-        )
-        
-        # Run backtest
-        results = backtester.run()
-        
-        # Get performance analyzer
-        performance_analyzer = backtester.get_performance_analyzer()
-        
-        # Get data information
-        data_handler = backtester.data_handler
-        data_points = len(performance_analyzer.equity_curve)
-        
-        # Calculate data statistics
-        data_stats = {}
-        for symbol in symbols:
-            if hasattr(data_handler, 'symbol_data') and symbol in data_handler.symbol_data:
-                # For Yahoo Finance data handler
-                symbol_data = data_handler.latest_symbol_data[symbol]
-                if symbol_data:
-                    closes = [bar[4] for bar in symbol_data]  # Close prices
-                    highs = [bar[2] for bar in symbol_data]   # High prices
-                    lows = [bar[3] for bar in symbol_data]    # Low prices
-                    volumes = [bar[6] for bar in symbol_data] # Volume
-                    
-                    # Calculate additional statistics
-                    returns = np.diff(closes) / closes[:-1]  # Daily returns
-                    
-                    data_stats[symbol] = {
-                        'count': len(closes),
-                        'price_mean': float(np.mean(closes)),
-                        'price_std': float(np.std(closes)),
-                        'price_min': float(np.min(closes)),
-                        'price_max': float(np.max(closes)),
-                        'high_mean': float(np.mean(highs)),
-                        'high_std': float(np.std(highs)),
-                        'high_min': float(np.min(highs)),
-                        'high_max': float(np.max(highs)),
-                        'low_mean': float(np.mean(lows)),
-                        'low_std': float(np.std(lows)),
-                        'low_min': float(np.min(lows)),
-                        'low_max': float(np.max(lows)),
-                        'volume_mean': float(np.mean(volumes)),
-                        'volume_std': float(np.std(volumes)),
-                        'volume_min': float(np.min(volumes)),
-                        'volume_max': float(np.max(volumes)),
-                        'return_mean': float(np.mean(returns) * 100),  # Convert to percentage
-                        'return_std': float(np.std(returns) * 100),   # Convert to percentage
-                        'return_min': float(np.min(returns) * 100),   # Convert to percentage
-                        'return_max': float(np.max(returns) * 100)    # Convert to percentage
-                    }
-        
-        data_info = {
-            'symbols': symbols,
-            'start_date': start_date_str,
-            'initial_capital': initial_capital,
-            'data_points': data_points,
-            'data_stats': data_stats
-        }
-        
-        # Create enhanced equity curve plot with drawdown
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12), gridspec_kw={'height_ratios': [3, 1]})
-        
+def _render_plot(performance_analyzer, plot_format):
+    """
+    Redraws the equity curve and drawdown plot on the persistent
+    figure and returns (image bytes, mime type).
+    """
+    with _FIG_LOCK:
+        ax1, ax2 = _AX1, _AX2
+        ax1.cla()
+        ax2.cla()
+
+        # Matplotlib gets plain NumPy arrays, extracted once, so the
+        # pandas Series never re-enters the plotting path. The dates
+        # are converted to float day numbers up front; both lines
+        # then go in as prebuilt LineCollection segment arrays, one
+        # artist per curve with no per-point conversion work.
+        eq_index = performance_analyzer.equity_curve.index
+        x = mdates.date2num(eq_index.to_numpy())
+        eq_values = np.ascontiguousarray(
+            performance_analyzer.equity_curve['equity_curve'].to_numpy(),
+            dtype=np.float64)
+
         # Plot equity curve
-        ax1.plot(performance_analyzer.equity_curve.index, 
-                performance_analyzer.equity_curve['equity_curve'], 
-                label='Equity Curve', color='blue', linewidth=2)
+        eq_points = np.column_stack([x, eq_values])
+        ax1.add_collection(LineCollection(
+            np.stack([eq_points[:-1], eq_points[1:]], axis=1),
+            colors='blue', linewidths=2, label='Equity Curve'))
+        ax1.xaxis_date()
+        ax1.autoscale_view()
         ax1.set_title('Equity Curve', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Cumulative Returns', fontsize=12)
         ax1.grid(True, alpha=0.3)
         ax1.legend()
-        
-        # Calculate and plot drawdown
-        cumulative = performance_analyzer.equity_curve['equity_curve']
-        cumulative_max = cumulative.cummax()
-        drawdown = (cumulative - cumulative_max) / cumulative_max * 100
-        ax2.fill_between(performance_analyzer.equity_curve.index, drawdown, 0, alpha=0.3, color='red')
-        ax2.plot(performance_analyzer.equity_curve.index, drawdown, color='red', linewidth=1)
+
+        # Calculate and plot drawdown: one compiled pass over the raw
+        # equity array instead of three pandas passes. The shaded
+        # area is one closed polygon along the curve and back across
+        # the zero line, replacing fill_between's per-span patches.
+        drawdown, max_dd_i = drawdown_curve(eq_values)
+        fill = np.empty((x.size + 2, 2), dtype=np.float64)
+        fill[1:-1, 0] = x
+        fill[1:-1, 1] = np.nan_to_num(drawdown, nan=0.0)
+        fill[0] = x[0], 0.0
+        fill[-1] = x[-1], 0.0
+        ax2.add_patch(Polygon(fill, closed=True, facecolor='red',
+                              alpha=0.3))
+        dd_points = np.column_stack([x, drawdown])
+        ax2.add_collection(LineCollection(
+            np.stack([dd_points[:-1], dd_points[1:]], axis=1),
+            colors='red', linewidths=1))
+        ax2.xaxis_date()
+        ax2.autoscale_view()
         ax2.set_title('Drawdown Analysis', fontsize=14, fontweight='bold')
         ax2.set_ylabel('Drawdown (%)', fontsize=12)
         ax2.grid(True, alpha=0.3)
         ax2.set_xlabel('Date', fontsize=12)
-        
+
         # Add max drawdown annotation
-        max_dd_idx = drawdown.idxmin()
-        max_dd_val = drawdown.min()
-        ax2.annotate(f'Max DD: {max_dd_val:.2f}%', 
+        max_dd_idx = x[max_dd_i]
+        max_dd_val = drawdown[max_dd_i]
+        ax2.annotate(f'Max DD: {max_dd_val:.2f}%',
                     xy=(max_dd_idx, max_dd_val),
                     xytext=(10, 10),
                     textcoords='offset points',
                     bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
                     arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
-        
-        plt.tight_layout()
-        
-        # Save plot to base64 string
+
+        # Render the plot. SVG is the default: text output
+        # with no PNG deflate pass, and it scales crisply in the
+        # browser. PNG stays available at a modest dpi with the
+        # cheapest compression level.
         img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
-        img_buffer.seek(0)
-        plot_url = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
-        
-        # Format results for JSON serialization
-        formatted_results = {}
-        for key, value in results.items():
-            if isinstance(value, np.float64) or isinstance(value, np.int64) or isinstance(value, np.float32):
-                # Handle special float values that are not JSON serializable
-                if np.isinf(value) or np.isnan(value):
-                    # Skip infinity and NaN values
-                    continue
-                else:
-                    formatted_results[key] = float(value)
-            elif isinstance(value, pd.Timestamp):
-                formatted_results[key] = str(value)
-            else:
-                formatted_results[key] = value
-        
-        # Add additional information
-        additional_info = {
-            'strategy_name': strategy_label,
-            'strategy_params': strategy_params,
-            'data_info': data_info
-        }
-        
-        return jsonify({
-            'success': True,
-            'results': formatted_results,
-            'additional_info': additional_info,
-            'plot': plot_url
-        })
-        
+        if plot_format == 'png':
+            _FIG.savefig(img_buffer, format='png', dpi=80,
+                         pil_kwargs={'compress_level': 1})
+            plot_mime = 'image/png'
+        else:
+            _FIG.savefig(img_buffer, format='svg')
+            plot_mime = 'image/svg+xml'
+    return img_buffer.getvalue(), plot_mime
+
+
+def _do_backtest(data):
+    """
+    Runs the blocking backtest and plotting work for one request.
+
+    Called from the run_backtest route through an executor so the
+    event loop stays free to serve other requests meanwhile.
+    """
+    # Get parameters from the request
+    symbols = data.get('symbols', 'AAPL').split(',')
+    symbols = [s.strip() for s in symbols]
+    strategy_name = data.get('strategy', 'buy_and_hold')
+    start_date_str = data.get('start_date', '2020-01-01')
+    initial_capital = float(data.get('initial_capital', 1000))
+    plot_format = data.get('plot_format', 'svg')
+    include_plot = bool(data.get('include_plot', True))
+    
+    # Parse start date; fromisoformat is the dedicated C fast path,
+    # with no format string to interpret per call
+    start_date = datetime.fromisoformat(start_date_str)
+    
+    # Select strategy
+    strategy, strategy_label, strategy_params = _STRATEGIES.get(
+        strategy_name, _STRATEGIES['buy_and_hold'])
+    
+    # Create backtester with Yahoo Finance data, served through the
+    # in-process download cache
+    def _handler(events, csv_dir, symbol_list):
+        return _CachedYahooHandler(events, csv_dir, symbol_list, start_date)
+
+    backtester = Backtester(
+        csv_dir=None,  # Not used with Yahoo Finance data
+        symbol_list=symbols,
+        initial_capital=initial_capital,
+        start_date=start_date,
+        data_handler=_handler,
+        strategy=strategy
+    )
+    
+    # Run backtest
+    results = backtester.run()
+    
+    # Get performance analyzer
+    performance_analyzer = backtester.get_performance_analyzer()
+    
+    # Get data information
+    data_handler = backtester.data_handler
+    data_points = len(performance_analyzer.equity_curve)
+    
+    # Calculate data statistics. The handler attribute checks are
+    # hoisted out of the loop: latest_symbol_data is a property that
+    # materializes bar tuples for every symbol, so it must be read
+    # exactly once rather than per symbol.
+    data_stats = {}
+    handler_symbol_data = getattr(data_handler, 'symbol_data', None)
+    latest_data = (data_handler.latest_symbol_data
+                   if handler_symbol_data is not None else {})
+    for symbol in symbols:
+        if handler_symbol_data is not None and symbol in handler_symbol_data:
+            # For Yahoo Finance data handler
+            symbol_data = latest_data[symbol]
+            if symbol_data:
+                # One 2D array over the numeric bar fields, then one
+                # fused sweep per column computing mean/std/min/max
+                # together instead of four reductions each reading
+                # the same memory. float32 halves the bandwidth of
+                # those sweeps; the kernel accumulates in float64 and
+                # the JSON output only shows display precision
+                # anyway. Columns after dropping the datetime:
+                # 0=open, 1=high, 2=low, 3=close, 4=adj_close,
+                # 5=volume.
+                arr = np.asarray([bar[1:] for bar in symbol_data],
+                                 dtype=np.float32)
+                price_stats = column_stats(arr[:, 3])
+                high_stats = column_stats(arr[:, 1])
+                low_stats = column_stats(arr[:, 2])
+                volume_stats = column_stats(arr[:, 5])
+
+                # Return statistics stream straight off the closes:
+                # the kernel computes each per-bar return in float64
+                # and accumulates the four moments without ever
+                # materializing a returns array. The cast is explicit
+                # so the float32 storage dtype never enters the
+                # ratio, where it would lose real digits.
+                closes = arr[:, 3].astype(np.float64)
+                rstats = return_stats(closes)
+
+                data_stats[symbol] = {
+                    'count': arr.shape[0],
+                    'price_mean': float(price_stats[0]),
+                    'price_std': float(price_stats[1]),
+                    'price_min': float(price_stats[2]),
+                    'price_max': float(price_stats[3]),
+                    'high_mean': float(high_stats[0]),
+                    'high_std': float(high_stats[1]),
+                    'high_min': float(high_stats[2]),
+                    'high_max': float(high_stats[3]),
+                    'low_mean': float(low_stats[0]),
+                    'low_std': float(low_stats[1]),
+                    'low_min': float(low_stats[2]),
+                    'low_max': float(low_stats[3]),
+                    'volume_mean': float(volume_stats[0]),
+                    'volume_std': float(volume_stats[1]),
+                    'volume_min': float(volume_stats[2]),
+                    'volume_max': float(volume_stats[3]),
+                    'return_mean': float(rstats[0]),  # Already in percent
+                    'return_std': float(rstats[1]),
+                    'return_min': float(rstats[2]),
+                    'return_max': float(rstats[3])
+                }
+    
+    data_info = {
+        'symbols': symbols,
+        'start_date': start_date_str,
+        'initial_capital': initial_capital,
+        'data_points': data_points,
+        'data_stats': data_stats
+    }
+    
+    # Render the plot unless the caller opted out; metrics-only
+    # sweeps skip the figure entirely, the largest CPU cost after
+    # the data fetch
+    if include_plot:
+        img_bytes, plot_mime = _render_plot(performance_analyzer,
+                                            plot_format)
+    else:
+        img_bytes = None
+        plot_mime = None
+
+    # Format results for JSON serialization: one isfinite pass over
+    # the numeric values instead of scalar isinf/isnan checks per key
+    numeric = [(k, v) for k, v in results.items()
+               if isinstance(v, (np.floating, np.integer))]
+    formatted_results = {}
+    if numeric:
+        num_keys = [k for k, _ in numeric]
+        arr = np.fromiter((v for _, v in numeric), dtype=np.float64,
+                          count=len(numeric))
+        good = np.isfinite(arr)
+        # Infinity and NaN values are dropped; they are not JSON
+        # serializable
+        formatted_results = {k: float(v)
+                             for k, v, g in zip(num_keys, arr, good) if g}
+    for key, value in results.items():
+        if isinstance(value, (np.floating, np.integer)):
+            continue
+        if isinstance(value, pd.Timestamp):
+            formatted_results[key] = str(value)
+        else:
+            formatted_results[key] = value
+    
+    # Add additional information
+    additional_info = {
+        'strategy_name': strategy_label,
+        'strategy_params': strategy_params,
+        'data_info': data_info
+    }
+    
+    # The raw bytes travel back to the serving process, which parks
+    # them in the plot cache and swaps in a plot_url (None when the
+    # plot was skipped)
+    return {
+        'success': True,
+        'results': formatted_results,
+        'additional_info': additional_info,
+        'plot_bytes': img_bytes,
+        'plot_mime': plot_mime
+    }
+
+
+@app.route('/run_backtest', methods=['POST'])
+async def run_backtest():
+    """Run a backtest and return the results."""
+    try:
+        data = await request.get_json()
+        loop = asyncio.get_event_loop()
+        payload = await loop.run_in_executor(_POOL, _do_backtest, data)
+        plot_bytes = payload.pop('plot_bytes', None)
+        plot_mime = payload.pop('plot_mime', None)
+        if plot_bytes is not None:
+            pid = uuid.uuid4().hex
+            _PLOT_CACHE[pid] = (plot_bytes, plot_mime)
+            while len(_PLOT_CACHE) > _PLOT_CACHE_MAX:
+                _PLOT_CACHE.popitem(last=False)
+            payload['plot_url'] = f'/plot/{pid}'
+        else:
+            payload['plot_url'] = None
+        return _json_response(payload)
     except Exception as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
         })
 
 
+@app.route('/plot/<pid>')
+async def plot(pid):
+    """Serve a rendered backtest plot by its cache id."""
+    try:
+        payload, mime = _PLOT_CACHE[pid]
+    except KeyError:
+        abort(404)
+    return await send_file(BytesIO(payload), mimetype=mime)
+
+
 @app.route('/strategies')
-def get_strategies():
+async def get_strategies():
     """Return a list of available strategies."""
-    strategies = [
-        {'name': 'buy_and_hold', 'label': 'Buy and Hold'},
-        {'name': 'moving_average', 'label': 'Moving Average Crossover'}
-    ]
-    return jsonify(strategies)
+    strategies = [{'name': name, 'label': label}
+                  for name, (_, label, _params) in _STRATEGIES.items()]
+    return _json_response(strategies)
 
 
 if __name__ == '__main__':
-    # Run the Flask app
+    # Warm the worker pool, then serve
+    _start_worker_pool()
     app.run(debug=True, host='0.0.0.0', port=8000)